@@ -4,37 +4,60 @@ Admin management tools for SideBet platform.
 """
 
 import sys
+import csv
 import argparse
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from app.db.session import engine
 from app.core.security import get_password_hash
 
+# Shared identifier lookup, constructed once and reused across commands
+USER_BY_IDENTIFIER = text("""
+    SELECT user_id, username, email, is_superuser 
+    FROM users 
+    WHERE username = :identifier OR email = :identifier;
+""")
+
+# Advisory lock key held while demoting admins (arbitrary, but fixed)
+DEMOTE_LOCK_KEY = 0x5B1D_AD01
+
+ROW_FORMAT = "{:<5} {:<15} {:<30} {:<6} {:<6} {:<10} {:<10}"
+TABLE_HEADER = ROW_FORMAT.format("ID", "Username", "Email", "Admin", "Active", "Status", "Balance")
+
 def list_users(admins_only=False):
     """List all users or just admins"""
+    if admins_only:
+        query = "SELECT user_id, username, email, is_superuser, is_active, status, balance FROM users WHERE is_superuser = true ORDER BY user_id;"
+        title = "Admin Users"
+    else:
+        query = "SELECT user_id, username, email, is_superuser, is_active, status, balance FROM users ORDER BY user_id;"
+        title = "All Users"
+    
+    # The whole table is rendered in memory for a single write, so a plain
+    # client-side cursor is enough
     with engine.connect() as conn:
-        if admins_only:
-            query = "SELECT user_id, username, email, is_superuser, is_active, status, balance FROM users WHERE is_superuser = true ORDER BY user_id;"
-            title = "Admin Users"
-        else:
-            query = "SELECT user_id, username, email, is_superuser, is_active, status, balance FROM users ORDER BY user_id;"
-            title = "All Users"
-        
-        result = conn.execute(text(query))
-        users = result.fetchall()
-        
-        print(f"\n=== {title} ===")
-        if not users:
-            print("No users found.")
-            return
-        
-        print(f"{'ID':<5} {'Username':<15} {'Email':<30} {'Admin':<6} {'Active':<6} {'Status':<10} {'Balance':<10}")
-        print("-" * 85)
-        
-        for user in users:
-            admin_status = "Yes" if user[3] else "No"
-            active_status = "Yes" if user[4] else "No"
-            balance = f"${user[6]/100:.2f}" if user[6] else "$0.00"
-            print(f"{user[0]:<5} {user[1]:<15} {user[2]:<30} {admin_status:<6} {active_status:<6} {user[5]:<10} {balance:<10}")
+        rows = [
+            ROW_FORMAT.format(
+                user[0],
+                user[1],
+                user[2],
+                "Yes" if user[3] else "No",
+                "Yes" if user[4] else "No",
+                user[5],
+                f"${user[6]/100:.2f}" if user[6] else "$0.00",
+            )
+            for user in conn.execute(text(query))
+        ]
+    
+    # Render the whole table and emit it with a single write
+    lines = ["", f"=== {title} ==="]
+    if rows:
+        lines += [TABLE_HEADER, "-" * 85]
+        lines += rows
+    else:
+        lines.append("No users found.")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 def create_admin(email, username, password="12345678"):
     """Create a new admin user"""
@@ -45,86 +68,128 @@ def create_admin(email, username, password="12345678"):
     hashed_password = get_password_hash(password)
     
     with engine.connect() as conn:
-        # Check if user exists
-        result = conn.execute(text("SELECT COUNT(*) FROM users WHERE username = :username OR email = :email;"), 
-                            {"username": username, "email": email})
-        count = result.scalar()
-        
-        if count > 0:
+        # Create admin user; the unique constraints on username/email reject duplicates
+        try:
+            conn.execute(text("""
+                INSERT INTO users (username, email, hashed_password, is_superuser, is_active, is_verified, status, balance, created_at)
+                VALUES (:username, :email, :password, true, true, true, 'active', 100000, NOW());
+            """), {"username": username, "email": email, "password": hashed_password})
+        except IntegrityError:
+            conn.rollback()
             print(f"Error: User with username '{username}' or email '{email}' already exists")
             return False
         
-        # Create admin user
-        conn.execute(text("""
-            INSERT INTO users (username, email, hashed_password, is_superuser, is_active, is_verified, status, balance, created_at)
-            VALUES (:username, :email, :password, true, true, true, 'active', 100000, NOW());
-        """), {"username": username, "email": email, "password": hashed_password})
-        
         conn.commit()
         
         print(f"✅ Admin user created: {username} ({email})")
         print(f"   Password: {password}")
         return True
 
+def create_admins_bulk(rows):
+    """Create many admin users in one INSERT.
+    
+    rows is an iterable of (email, username, password) tuples. Existing
+    usernames/emails are skipped and reported.
+    """
+    params = []
+    for email, username, password in rows:
+        if not email.endswith("@college.harvard.edu"):
+            print(f"Skipping {username}: email must end with @college.harvard.edu")
+            continue
+        params.append({
+            "username": username,
+            "email": email,
+            "password": get_password_hash(password),
+        })
+    
+    if not params:
+        print("No admin users to create.")
+        return 0
+    
+    with engine.connect() as conn:
+        # One multi-row INSERT over parallel arrays; RETURNING reports which rows
+        # were actually created (conflicting usernames/emails return nothing)
+        created = conn.execute(text("""
+            INSERT INTO users (username, email, hashed_password, is_superuser, is_active, is_verified, status, balance, created_at)
+            SELECT u.username, u.email, u.password, true, true, true, 'active', 100000, NOW()
+            FROM unnest(CAST(:usernames AS text[]), CAST(:emails AS text[]), CAST(:passwords AS text[]))
+                AS u(username, email, password)
+            ON CONFLICT DO NOTHING
+            RETURNING username;
+        """), {
+            "usernames": [p["username"] for p in params],
+            "emails": [p["email"] for p in params],
+            "passwords": [p["password"] for p in params],
+        }).scalars().all()
+        conn.commit()
+    
+    created_usernames = set(created)
+    for p in params:
+        if p["username"] not in created_usernames:
+            print(f"Error: User with username '{p['username']}' or email '{p['email']}' already exists")
+    
+    print(f"✅ Created {len(created)} of {len(params)} admin user(s)")
+    return len(created)
+
+def _describe_user(conn, identifier):
+    """Look up a user's current admin flag (used only to explain a no-op update)"""
+    return conn.execute(USER_BY_IDENTIFIER, {"identifier": identifier}).fetchone()
+
 def promote_user(identifier):
     """Promote a user to admin by email or username"""
     with engine.connect() as conn:
-        # Find user
+        # Promote in a single conditional UPDATE
         result = conn.execute(text("""
-            SELECT user_id, username, email, is_superuser 
-            FROM users 
-            WHERE username = :identifier OR email = :identifier;
+            UPDATE users SET is_superuser = true
+            WHERE (username = :identifier OR email = :identifier) AND is_superuser = false
+            RETURNING user_id, username, email;
         """), {"identifier": identifier})
         
         user = result.fetchone()
-        if not user:
-            print(f"Error: User not found - {identifier}")
-            return False
+        conn.commit()
         
-        if user[3]:  # is_superuser
-            print(f"User {user[1]} is already an admin")
+        if not user:
+            existing = _describe_user(conn, identifier)
+            if not existing:
+                print(f"Error: User not found - {identifier}")
+                return False
+            print(f"User {existing[1]} is already an admin")
             return True
         
-        # Promote to admin
-        conn.execute(text("UPDATE users SET is_superuser = true WHERE user_id = :user_id;"), 
-                    {"user_id": user[0]})
-        conn.commit()
-        
         print(f"✅ User promoted to admin: {user[1]} ({user[2]})")
         return True
 
 def demote_user(identifier):
     """Demote an admin user to regular user by email or username"""
     with engine.connect() as conn:
-        # Find user
+        # Serialize demotions for the rest of this transaction; otherwise two
+        # concurrent demotes of different admins could each see a count of 2
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key);"), {"key": DEMOTE_LOCK_KEY})
+        
+        # Demote in a single UPDATE, guarded so the last admin is never demoted.
+        # Under READ COMMITTED this statement's snapshot is taken after the lock,
+        # so it sees any demotion committed by the previous holder
         result = conn.execute(text("""
-            SELECT user_id, username, email, is_superuser 
-            FROM users 
-            WHERE username = :identifier OR email = :identifier;
+            UPDATE users SET is_superuser = false
+            WHERE (username = :identifier OR email = :identifier) AND is_superuser = true
+              AND (SELECT COUNT(*) FROM users WHERE is_superuser = true) > 1
+            RETURNING user_id, username, email;
         """), {"identifier": identifier})
         
         user = result.fetchone()
-        if not user:
-            print(f"Error: User not found - {identifier}")
-            return False
-        
-        if not user[3]:  # is_superuser
-            print(f"User {user[1]} is not an admin")
-            return True
-        
-        # Check if this is the last admin
-        result = conn.execute(text("SELECT COUNT(*) FROM users WHERE is_superuser = true;"))
-        admin_count = result.scalar()
+        conn.commit()
         
-        if admin_count <= 1:
+        if not user:
+            existing = _describe_user(conn, identifier)
+            if not existing:
+                print(f"Error: User not found - {identifier}")
+                return False
+            if not existing[3]:  # is_superuser
+                print(f"User {existing[1]} is not an admin")
+                return True
             print("Error: Cannot demote the last admin user")
             return False
         
-        # Demote user
-        conn.execute(text("UPDATE users SET is_superuser = false WHERE user_id = :user_id;"), 
-                    {"user_id": user[0]})
-        conn.commit()
-        
         print(f"✅ Admin demoted to user: {user[1]} ({user[2]})")
         return True
 
@@ -134,13 +199,7 @@ def reset_password(identifier, new_password="12345678"):
     
     with engine.connect() as conn:
         # Find user
-        result = conn.execute(text("""
-            SELECT user_id, username, email 
-            FROM users 
-            WHERE username = :identifier OR email = :identifier;
-        """), {"identifier": identifier})
-        
-        user = result.fetchone()
+        user = conn.execute(USER_BY_IDENTIFIER, {"identifier": identifier}).fetchone()
         if not user:
             print(f"Error: User not found - {identifier}")
             return False
@@ -154,6 +213,37 @@ def reset_password(identifier, new_password="12345678"):
         print(f"   New password: {new_password}")
         return True
 
+def reset_passwords_bulk(identifiers, new_password="12345678"):
+    """Reset the password for many users in one UPDATE"""
+    hashed_password = get_password_hash(new_password)
+    
+    with engine.connect() as conn:
+        # Update every matching user at once, then pair each identifier with the
+        # user it matched (NULL when it matched nobody)
+        rows = conn.execute(text("""
+            WITH ids AS (
+                SELECT DISTINCT unnest(CAST(:identifiers AS text[])) AS identifier
+            ), updated AS (
+                UPDATE users SET hashed_password = :password
+                WHERE username IN (SELECT identifier FROM ids) OR email IN (SELECT identifier FROM ids)
+                RETURNING username, email
+            )
+            SELECT ids.identifier, updated.username
+            FROM ids LEFT JOIN updated
+              ON updated.username = ids.identifier OR updated.email = ids.identifier;
+        """), {"identifiers": list(identifiers), "password": hashed_password}).fetchall()
+        conn.commit()
+    
+    for identifier, username in rows:
+        if username is None:
+            print(f"Error: User not found - {identifier}")
+    
+    reset_usernames = sorted({username for _, username in rows if username is not None})
+    if reset_usernames:
+        print(f"✅ Password reset for {len(reset_usernames)} user(s): {', '.join(reset_usernames)}")
+        print(f"   New password: {new_password}")
+    return len(reset_usernames)
+
 def main():
     parser = argparse.ArgumentParser(description="SideBet Admin Management Tools")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -168,6 +258,10 @@ def main():
     create_parser.add_argument('username', help='Admin username')
     create_parser.add_argument('--password', default='12345678', help='Admin password (default: 12345678)')
     
+    # Bulk create admins command
+    create_bulk_parser = subparsers.add_parser('create-bulk', help='Create admin users from a CSV file')
+    create_bulk_parser.add_argument('file', help='CSV file with email,username[,password] rows')
+    
     # Promote user command
     promote_parser = subparsers.add_parser('promote', help='Promote user to admin')
     promote_parser.add_argument('user', help='Username or email to promote')
@@ -178,7 +272,7 @@ def main():
     
     # Reset password command
     reset_parser = subparsers.add_parser('reset-password', help='Reset user password')
-    reset_parser.add_argument('user', help='Username or email')
+    reset_parser.add_argument('user', nargs='+', help='Username(s) or email(s)')
     reset_parser.add_argument('--password', default='12345678', help='New password (default: 12345678)')
     
     args = parser.parse_args()
@@ -194,12 +288,22 @@ def main():
         list_users(args.admins)
     elif args.command == 'create':
         create_admin(args.email, args.username, args.password)
+    elif args.command == 'create-bulk':
+        with open(args.file, newline='') as f:
+            rows = [
+                (row[0].strip(), row[1].strip(), row[2].strip() if len(row) > 2 and row[2].strip() else "12345678")
+                for row in csv.reader(f) if len(row) >= 2
+            ]
+        create_admins_bulk(rows)
     elif args.command == 'promote':
         promote_user(args.user)
     elif args.command == 'demote':
         demote_user(args.user)
     elif args.command == 'reset-password':
-        reset_password(args.user, args.password)
+        if len(args.user) == 1:
+            reset_password(args.user[0], args.password)
+        else:
+            reset_passwords_bulk(args.user, args.password)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
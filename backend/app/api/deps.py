@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
@@ -5,6 +6,7 @@ from jose import jwt, JWTError
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.security import ALGORITHM
 from app.db.session import SessionLocal
@@ -13,17 +15,33 @@ from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached snapshot of the fields needed to authorize a request."""
+    user_id: int
+    email: str
+    username: str
+    profile_picture: Optional[str]
+    is_active: bool
+    is_superuser: bool
+
+# Auth principals keyed by email (the JWT subject)
+user_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Shared home/trending idea feed pages (see endpoints/ideas.py). Like/comment
+# counts may lag by up to the TTL; new ideas, moderation and author profile
+# changes clear it via invalidate_feed_cache
+feed_cache = TTLCache(maxsize=64, ttl=30)
+
 def get_db() -> Generator:
+    # Sessions draw from the shared, pre-pinged QueuePool configured in app.db.session
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         yield db
     finally:
         db.close()
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> User:
+def get_token_email(request: Request) -> str:
     # Get token from cookie instead of Authorization header
     token = request.cookies.get("token")
     if not token:
@@ -31,7 +49,7 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
-    
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
@@ -47,10 +65,70 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
-    
+    return email
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> User:
+    email = get_token_email(request)
+
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return user 
\ No newline at end of file
+    return user
+
+def get_current_user_cached(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> CurrentUser:
+    """
+    Resolve the authenticated user as a CurrentUser snapshot, served from
+    user_cache for up to its TTL. Use this for endpoints that only need the
+    caller's identity and permission flags; use get_current_user when the
+    endpoint reads or mutates other user columns (balance, password, ...).
+    """
+    email = get_token_email(request)
+
+    principal = user_cache.get(email)
+    if principal is None:
+        row = db.query(
+            User.user_id, User.email, User.username, User.profile_picture,
+            User.is_active, User.is_superuser
+        ).filter(User.email == email).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = CurrentUser(
+            user_id=row.user_id,
+            email=row.email,
+            username=row.username,
+            profile_picture=row.profile_picture,
+            is_active=bool(row.is_active),
+            is_superuser=bool(row.is_superuser),
+        )
+        user_cache.set(email, principal)
+
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+def require_admin(
+    current_user: CurrentUser = Depends(get_current_user_cached)
+) -> CurrentUser:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can access this resource",
+        )
+    return current_user
+
+def invalidate_cached_user(email: Optional[str]) -> None:
+    """Drop a user's cached principal after their status, role, profile or account changes."""
+    if email:
+        user_cache.pop(email)
+
+def invalidate_feed_cache() -> None:
+    """Drop cached feed pages after an idea is added, removed or moderated, or an author's profile changes."""
+    feed_cache.clear()
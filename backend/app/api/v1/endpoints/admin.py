@@ -2,13 +2,15 @@
 Admin-specific API endpoints for system administration.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, and_, or_
+import base64
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, selectinload, load_only
+from sqlalchemy import func, desc, and_, or_, case, tuple_, select, update, delete, union_all, literal, null, bindparam, lambda_stmt, String, text
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 
 from app.api import deps
+from app.core.cache import TTLCache
 from app.models.user import User
 from app.models.market import Market
 from app.models.contract import Contract
@@ -16,86 +18,121 @@ from app.models.order import Order
 from app.models.trade import Trade
 from app.models.position import Position
 from app.models.idea import Idea
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, AdminUserResponse
 from app.schemas.idea import IdeaResponse
 
 router = APIRouter()
 
-@router.get("/users/search")
+# Hot primary-key lookups, built once so SQLAlchemy can reuse their cached compilation
+USER_DELETE = lambda_stmt(
+    lambda: delete(User)
+    .where(User.user_id == bindparam("user_id"))
+    .returning(User.username, User.email)
+)
+IDEA_BY_ID = lambda_stmt(lambda: select(Idea).where(Idea.idea_id == bindparam("idea_id")))
+MARKET_ID_BY_ID = lambda_stmt(
+    lambda: select(Market.market_id).where(Market.market_id == bindparam("market_id"))
+)
+
+# Dashboard aggregates tolerate short staleness; admin mutations clear it early.
+# Per-endpoint TTLs (seconds) reflect how quickly each payload changes.
+stats_cache = TTLCache(maxsize=256, ttl=30)
+STATS_TTL = {
+    "user_stats": 60,
+    "market_stats": 60,
+    "dashboard_overview": 30,
+    "ideas_stats": 120,
+    "recent_activity": 15,
+}
+
+# Columns serialized by AdminUserResponse
+ADMIN_USER_COLUMNS = (
+    User.user_id, User.username, User.email, User.is_active,
+    User.is_superuser, User.is_verified, User.status, User.balance,
+    User.profile_picture, User.created_at
+)
+
+# Whether similarity() exists. pg_trgm is installed best-effort by
+# create_indexes, so check once per process and rank by username without it.
+_pg_trgm_available: Optional[bool] = None
+
+def _has_pg_trgm(db: Session) -> bool:
+    global _pg_trgm_available
+    if _pg_trgm_available is None:
+        _pg_trgm_available = bool(db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ).scalar())
+    return _pg_trgm_available
+
+@router.get("/users/search", response_model=List[AdminUserResponse])
 def search_users_admin(
     q: str = Query(..., min_length=1, max_length=100),
     limit: int = Query(50, le=100),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
     """Search users with admin privileges."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can search users"
-        )
-    
-    users = db.query(User).filter(
+    # Match on lower(...) so the pg_trgm GIN indexes can serve the substring
+    # search; autoescape keeps a literal % or _ in q from widening the match
+    term = q.lower()
+    username, email = func.lower(User.username), func.lower(User.email)
+    if _has_pg_trgm(db):
+        # Closest matches first, so the limit keeps the most relevant users
+        ordering = desc(func.greatest(func.similarity(username, term), func.similarity(email, term)))
+    else:
+        ordering = User.username
+    users = db.query(User).options(load_only(*ADMIN_USER_COLUMNS)).filter(
         or_(
-            User.username.ilike(f"%{q}%"),
-            User.email.ilike(f"%{q}%")
+            username.contains(term, autoescape=True),
+            email.contains(term, autoescape=True)
         )
-    ).limit(limit).all()
+    ).order_by(ordering, User.user_id).limit(limit).all()
     
     return users
 
-@router.get("/users/stats")
-def get_user_statistics(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
-):
-    """Get comprehensive user statistics."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view user statistics"
-        )
-    
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    verified_users = db.query(User).filter(User.is_verified == True).count()
-    admin_users = db.query(User).filter(User.is_superuser == True).count()
-    
+def _compute_user_statistics(db: Session) -> dict:
+    """Aggregate user metrics for the admin dashboard."""
     # Users registered in the last 30 days
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    new_users = db.query(User).filter(User.created_at >= thirty_days_ago).count()
     
-    # Total balance across all users
-    total_balance = db.query(func.sum(User.balance)).scalar() or 0
+    # All user metrics in a single scan using filtered aggregates
+    stats = db.query(
+        func.count().label("total"),
+        func.count().filter(User.is_active == True).label("active"),
+        func.count().filter(User.is_verified == True).label("verified"),
+        func.count().filter(User.is_superuser == True).label("admins"),
+        func.count().filter(User.created_at >= thirty_days_ago).label("new_30d"),
+        func.coalesce(func.sum(User.balance), 0).label("total_balance"),
+    ).select_from(User).one()
     
     return {
-        "total_users": total_users,
-        "active_users": active_users,
-        "verified_users": verified_users,
-        "admin_users": admin_users,
-        "new_users_30d": new_users,
-        "total_balance": total_balance,
-        "average_balance": total_balance / max(1, total_users)
+        "total_users": stats.total,
+        "active_users": stats.active,
+        "verified_users": stats.verified,
+        "admin_users": stats.admins,
+        "new_users_30d": stats.new_30d,
+        "total_balance": stats.total_balance,
+        "average_balance": stats.total_balance / max(1, stats.total)
     }
 
+@router.get("/users/stats")
+def get_user_statistics(
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
+    db: Session = Depends(deps.get_db),
+):
+    """Get comprehensive user statistics."""
+    return stats_cache.get_or_set(
+        "user_stats", lambda: _compute_user_statistics(db), ttl=STATS_TTL["user_stats"]
+    )
+
 @router.put("/users/{user_id}/status")
 def update_user_status(
     user_id: int,
     status_data: dict,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
     """Update user status (active/suspended)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can update user status"
-        )
-    
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Prevent admin from deactivating themselves
     if user_id == current_user.user_id:
         raise HTTPException(
@@ -103,35 +140,43 @@ def update_user_status(
             detail="Cannot modify your own status"
         )
     
+    values = {}
     if "is_active" in status_data:
-        user.is_active = status_data["is_active"]
+        values["is_active"] = status_data["is_active"]
     
     if "status" in status_data:
-        user.status = status_data["status"]
+        values["status"] = status_data["status"]
+    
+    if values:
+        # Single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh
+        user = db.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(**values)
+            .returning(*ADMIN_USER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        ).first()
+    else:
+        user = db.execute(
+            select(*ADMIN_USER_COLUMNS).where(User.user_id == user_id)
+        ).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
     db.commit()
-    db.refresh(user)
+    stats_cache.clear()
+    deps.invalidate_cached_user(user.email)
     
-    return {"message": f"User status updated successfully", "user": user}
+    return {"message": f"User status updated successfully", "user": AdminUserResponse.model_validate(user)}
 
 @router.put("/users/{user_id}/admin")
 def toggle_admin_status(
     user_id: int,
     admin_data: dict,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
     """Grant or revoke admin privileges."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can modify admin privileges"
-        )
-    
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Prevent admin from removing their own admin status
     if user_id == current_user.user_id:
         raise HTTPException(
@@ -139,314 +184,398 @@ def toggle_admin_status(
             detail="Cannot modify your own admin status"
         )
     
-    user.is_superuser = admin_data.get("is_superuser", False)
+    user = db.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(is_superuser=admin_data.get("is_superuser", False))
+        .returning(*ADMIN_USER_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
     db.commit()
-    db.refresh(user)
+    stats_cache.clear()
+    deps.invalidate_cached_user(user.email)
     
     action = "granted" if user.is_superuser else "revoked"
-    return {"message": f"Admin privileges {action} successfully", "user": user}
+    return {"message": f"Admin privileges {action} successfully", "user": AdminUserResponse.model_validate(user)}
 
 @router.post("/users/{user_id}/balance")
 def adjust_user_balance(
     user_id: int,
     balance_data: dict,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
     """Adjust user balance (admin only)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can adjust user balances"
-        )
-    
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     amount = balance_data.get("amount", 0)
     operation = balance_data.get("operation", "add")  # "add" or "set"
     reason = balance_data.get("reason", "Admin adjustment")
     
-    old_balance = user.balance
-    
     if operation == "add":
-        user.balance += amount
+        new_balance = func.coalesce(User.balance, 0) + amount
     elif operation == "set":
-        user.balance = amount
+        new_balance = literal(amount)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Operation must be 'add' or 'set'"
         )
     
-    # Ensure balance doesn't go negative
-    if user.balance < 0:
-        user.balance = 0
+    # Lock the row and read its previous balance in the same statement, so the
+    # adjustment is one atomic UPDATE ... RETURNING with no lost updates
+    old = select(User.user_id, User.balance).where(
+        User.user_id == user_id
+    ).with_for_update().subquery()
+    
+    result = db.execute(
+        update(User)
+        .where(User.user_id == old.c.user_id)
+        .values(balance=func.greatest(0, new_balance))  # Ensure balance doesn't go negative
+        .returning(old.c.balance.label("old_balance"), User.balance.label("new_balance"))
+        .execution_options(synchronize_session=False)
+    ).first()
+    if not result:
+        raise HTTPException(status_code=404, detail="User not found")
     
     db.commit()
-    db.refresh(user)
+    stats_cache.clear()
+    
+    old_balance = result.old_balance or 0
     
     return {
         "message": f"Balance adjusted successfully",
         "old_balance": old_balance,
-        "new_balance": user.balance,
-        "adjustment": user.balance - old_balance,
+        "new_balance": result.new_balance,
+        "adjustment": result.new_balance - old_balance,
         "reason": reason
     }
 
-@router.get("/markets/stats")
-def get_market_statistics(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
-):
-    """Get comprehensive market statistics."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view market statistics"
-        )
-    
-    total_markets = db.query(Market).count()
-    open_markets = db.query(Market).filter(Market.status == "open").count()
-    closed_markets = db.query(Market).filter(Market.status == "closed").count()
-    resolved_markets = db.query(Market).filter(Market.status == "resolved").count()
-    
+def _compute_market_statistics(db: Session) -> dict:
+    """Aggregate market and trading metrics for the admin dashboard."""
     # Markets created in the last 30 days
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    new_markets = db.query(Market).filter(Market.start_time >= thirty_days_ago).count()
-    
-    # Total trading volume
-    total_trades = db.query(Trade).count()
-    total_volume = db.query(func.sum(Trade.quantity * Trade.price)).scalar() or 0
     
-    # Average market duration
-    resolved_markets_with_duration = db.query(Market).filter(
+    market_stats = db.query(
+        func.count().label("total"),
+        func.count().filter(Market.status == "open").label("open"),
+        func.count().filter(Market.status == "closed").label("closed"),
+        func.count().filter(Market.status == "resolved").label("resolved"),
+        func.count().filter(Market.start_time >= thirty_days_ago).label("new_30d"),
+        func.coalesce(func.sum(Market.total_volume), 0).label("volume"),
+    ).select_from(Market).one()
+    
+    total_trades = db.query(func.count()).select_from(Trade).scalar()
+    
+    # Average market duration, aggregated in the database
+    avg_duration_seconds = db.query(
+        func.avg(func.extract("epoch", Market.resolve_time - Market.start_time))
+    ).filter(
         and_(
             Market.status == "resolved",
             Market.resolve_time.isnot(None)
         )
-    ).all()
+    ).scalar()
     
-    avg_duration_hours = 0
-    if resolved_markets_with_duration:
-        total_duration = sum([
-            (market.resolve_time - market.start_time).total_seconds() / 3600
-            for market in resolved_markets_with_duration
-        ])
-        avg_duration_hours = total_duration / len(resolved_markets_with_duration)
+    avg_duration_hours = float(avg_duration_seconds or 0) / 3600
     
     return {
-        "total_markets": total_markets,
-        "open_markets": open_markets,
-        "closed_markets": closed_markets,
-        "resolved_markets": resolved_markets,
-        "new_markets_30d": new_markets,
+        "total_markets": market_stats.total,
+        "open_markets": market_stats.open,
+        "closed_markets": market_stats.closed,
+        "resolved_markets": market_stats.resolved,
+        "new_markets_30d": market_stats.new_30d,
         "total_trades": total_trades,
-        "total_volume": float(total_volume),
+        "total_volume": float(market_stats.volume),
         "avg_duration_hours": avg_duration_hours
     }
 
-@router.get("/dashboard/overview")
-def get_admin_dashboard_overview(
-    current_user: User = Depends(deps.get_current_user),
+@router.get("/markets/stats")
+def get_market_statistics(
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
-    """Get overview data for admin dashboard."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view dashboard overview"
-        )
-    
-    # User metrics
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    
-    # Market metrics
-    total_markets = db.query(Market).count()
-    active_markets = db.query(Market).filter(Market.status == "open").count()
-    
-    # Trading metrics
-    total_trades = db.query(Trade).count()
-    total_orders = db.query(Order).count()
-    active_orders = db.query(Order).filter(Order.status.in_(["open", "partially_filled"])).count()
-    
-    # Volume metrics
-    total_volume = db.query(func.sum(Trade.quantity * Trade.price)).scalar() or 0
-    total_balance = db.query(func.sum(User.balance)).scalar() or 0
-    
+    """Get comprehensive market statistics."""
+    return stats_cache.get_or_set(
+        "market_stats", lambda: _compute_market_statistics(db), ttl=STATS_TTL["market_stats"]
+    )
+
+def _compute_dashboard_overview(db: Session) -> dict:
+    """Aggregate cross-table overview metrics for the admin dashboard."""
     # Recent activity (last 24 hours)
     yesterday = datetime.now(timezone.utc) - timedelta(hours=24)
-    recent_users = db.query(User).filter(User.created_at >= yesterday).count()
-    recent_markets = db.query(Market).filter(Market.start_time >= yesterday).count()
-    recent_trades = db.query(Trade).filter(Trade.executed_at >= yesterday).count()
+    
+    # One aggregate query per table
+    user_stats = db.query(
+        func.count().label("total"),
+        func.count().filter(User.is_active == True).label("active"),
+        func.count().filter(User.created_at >= yesterday).label("recent"),
+        func.coalesce(func.sum(User.balance), 0).label("total_balance"),
+    ).select_from(User).one()
+    
+    market_stats = db.query(
+        func.count().label("total"),
+        func.count().filter(Market.status == "open").label("active"),
+        func.count().filter(Market.start_time >= yesterday).label("recent"),
+        func.coalesce(func.sum(Market.total_volume), 0).label("volume"),
+    ).select_from(Market).one()
+    
+    trade_stats = db.query(
+        func.count().label("total"),
+        func.count().filter(Trade.executed_at >= yesterday).label("recent"),
+    ).select_from(Trade).one()
+    
+    order_stats = db.query(
+        func.count().label("total"),
+        func.count().filter(Order.status.in_(["open", "partially_filled"])).label("active"),
+    ).select_from(Order).one()
     
     return {
         "users": {
-            "total": total_users,
-            "active": active_users,
-            "recent_24h": recent_users
+            "total": user_stats.total,
+            "active": user_stats.active,
+            "recent_24h": user_stats.recent
         },
         "markets": {
-            "total": total_markets,
-            "active": active_markets,
-            "recent_24h": recent_markets
+            "total": market_stats.total,
+            "active": market_stats.active,
+            "recent_24h": market_stats.recent
         },
         "trading": {
-            "total_trades": total_trades,
-            "total_orders": total_orders,
-            "active_orders": active_orders,
-            "recent_trades_24h": recent_trades,
-            "total_volume": float(total_volume),
-            "total_balance": total_balance
+            "total_trades": trade_stats.total,
+            "total_orders": order_stats.total,
+            "active_orders": order_stats.active,
+            "recent_trades_24h": trade_stats.recent,
+            "total_volume": float(market_stats.volume),
+            "total_balance": user_stats.total_balance
         }
     }
 
-@router.get("/activity/recent")
-def get_recent_activity(
-    limit: int = Query(20, le=100),
-    current_user: User = Depends(deps.get_current_user),
+@router.get("/dashboard/overview")
+def get_admin_dashboard_overview(
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
-    """Get recent system activity for admin dashboard."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view system activity"
-        )
+    """Get overview data for admin dashboard."""
+    return stats_cache.get_or_set(
+        "dashboard_overview", lambda: _compute_dashboard_overview(db), ttl=STATS_TTL["dashboard_overview"]
+    )
+
+def _compute_recent_activity(db: Session, limit: int) -> list:
+    """Merge the latest registrations, market events and high-volume markets."""
+    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
     
-    activities = []
+    # Every activity source projects the same (type, ts, entity_id, name, detail)
+    # shape so they can be merged and ordered in a single round-trip
     
     # Recent user registrations (last 7 days)
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    recent_users = db.query(User).filter(
+    recent_users = select(
+        literal("user_registered", String).label("type"),
+        User.created_at.label("ts"),
+        User.user_id.label("entity_id"),
+        User.username.label("name"),
+        null().label("detail"),
+    ).where(
         User.created_at >= seven_days_ago
-    ).order_by(desc(User.created_at)).limit(3).all()
-    for user in recent_users:
-        activities.append({
-            "type": "user_registered",
-            "message": f"New user registered: {user.username}",
-            "timestamp": user.created_at,
-            "user": "system",
-            "details": {"user_id": user.user_id, "username": user.username}
-        })
+    ).order_by(desc(User.created_at)).limit(3)
     
     # Recent market creations (last 7 days)
-    recent_markets = db.query(Market).filter(
+    recent_markets = select(
+        literal("market_created", String),
+        Market.created_at,
+        Market.market_id,
+        Market.title,
+        Market.category,
+    ).where(
         Market.created_at >= seven_days_ago
-    ).order_by(desc(Market.created_at)).limit(3).all()
-    for market in recent_markets:
-        activities.append({
-            "type": "market_created",
-            "message": f"New market created: {market.title}",
-            "timestamp": market.created_at,
-            "user": "admin",
-            "details": {"market_id": market.market_id, "category": market.category}
-        })
+    ).order_by(desc(Market.created_at)).limit(3)
     
     # Recent market resolutions (last 7 days)
-    recent_resolved = db.query(Market).filter(
+    recent_resolved = select(
+        literal("market_resolved", String),
+        Market.resolve_time,
+        Market.market_id,
+        Market.title,
+        Market.result,
+    ).where(
         and_(
             Market.status == "resolved",
             Market.resolve_time >= seven_days_ago,
             Market.resolve_time.isnot(None)
         )
-    ).order_by(desc(Market.resolve_time)).limit(3).all()
-    for market in recent_resolved:
-        activities.append({
-            "type": "market_resolved",
-            "message": f"Market resolved: {market.title} -> {market.result}",
-            "timestamp": market.resolve_time,
-            "user": "admin",
-            "details": {"market_id": market.market_id, "result": market.result}
-        })
-    
-    # Recent high-volume trading (last 24 hours)
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
-    high_volume_markets = db.query(Market).join(Contract).join(Trade).filter(
+    ).order_by(desc(Market.resolve_time)).limit(3)
+    
+    # Recent high-volume trading (last 24 hours), pre-aggregated per market on
+    # the trades side so only the two matching market rows are read
+    market_volume = select(
+        Contract.market_id,
+        func.max(Trade.executed_at).label("last_trade_at"),
+    ).join(Trade, Trade.contract_id == Contract.contract_id).where(
         Trade.executed_at >= one_day_ago
-    ).group_by(Market.market_id).having(
+    ).group_by(Contract.market_id).having(
         func.sum(Trade.quantity * Trade.price) > 10000  # $100+ in volume
-    ).order_by(desc(func.max(Trade.executed_at))).limit(2).all()
-    
-    for market in high_volume_markets:
-        activities.append({
-            "type": "high_volume",
-            "message": f"High trading volume in: {market.title}",
-            "timestamp": one_day_ago,  # Approximate timestamp
-            "user": "system",
-            "details": {"market_id": market.market_id, "category": market.category}
-        })
-    
-    # Sort by timestamp and limit
-    activities.sort(key=lambda x: x["timestamp"], reverse=True)
-    return activities[:limit]
+    ).cte("market_volume")
+    
+    high_volume_markets = select(
+        literal("high_volume", String),
+        market_volume.c.last_trade_at,
+        Market.market_id,
+        Market.title,
+        Market.category,
+    ).join(
+        market_volume, market_volume.c.market_id == Market.market_id
+    ).order_by(desc(market_volume.c.last_trade_at)).limit(2)
+    
+    combined = union_all(
+        recent_users, recent_markets, recent_resolved, high_volume_markets
+    ).subquery()
+    rows = db.execute(
+        select(combined).order_by(desc(combined.c.ts)).limit(limit)
+    ).all()
+    
+    activities = []
+    for row in rows:
+        if row.type == "user_registered":
+            activities.append({
+                "type": row.type,
+                "message": f"New user registered: {row.name}",
+                "timestamp": row.ts,
+                "user": "system",
+                "details": {"user_id": row.entity_id, "username": row.name}
+            })
+        elif row.type == "market_created":
+            activities.append({
+                "type": row.type,
+                "message": f"New market created: {row.name}",
+                "timestamp": row.ts,
+                "user": "admin",
+                "details": {"market_id": row.entity_id, "category": row.detail}
+            })
+        elif row.type == "market_resolved":
+            activities.append({
+                "type": row.type,
+                "message": f"Market resolved: {row.name} -> {row.detail}",
+                "timestamp": row.ts,
+                "user": "admin",
+                "details": {"market_id": row.entity_id, "result": row.detail}
+            })
+        else:
+            activities.append({
+                "type": row.type,
+                "message": f"High trading volume in: {row.name}",
+                "timestamp": row.ts,
+                "user": "system",
+                "details": {"market_id": row.entity_id, "category": row.detail}
+            })
+    
+    return activities
+
+@router.get("/activity/recent")
+def get_recent_activity(
+    limit: int = Query(20, le=100),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
+    db: Session = Depends(deps.get_db),
+):
+    """Get recent system activity for admin dashboard."""
+    return stats_cache.get_or_set(
+        ("recent_activity", limit),
+        lambda: _compute_recent_activity(db, limit),
+        ttl=STATS_TTL["recent_activity"]
+    )
 
 @router.delete("/users/{user_id}")
 def delete_user_admin(
     user_id: int,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
     """Delete a user account (admin only)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can delete users"
-        )
-    
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Prevent admin from deleting themselves
+    # Prevent admin from deleting themselves (checked before touching the DB)
     if user_id == current_user.user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete your own account"
         )
     
-    # Store user info for response
-    username = user.username
-    email = user.email
-    
-    # Delete user (cascade will handle related data)
-    db.delete(user)
+    # Single DELETE; the ON DELETE CASCADE / SET NULL foreign keys clean up
+    # orders (and their trades), positions, follows, likes, comments and bookmarks
+    deleted = db.execute(USER_DELETE, {"user_id": user_id}).first()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="User not found")
     db.commit()
     
+    username, email = deleted.username, deleted.email
+    stats_cache.clear()
+    deps.invalidate_feed_cache()
+    deps.invalidate_cached_user(email)
+    
     return {
         "message": f"User {username} ({email}) deleted successfully",
         "deleted_user_id": user_id
     } 
 
+# Moderation order: pending first, then accepted, then rejected
+IDEA_STATUS_RANK = case(
+    (Idea.status == "pending", 0),
+    (Idea.status == "accepted", 1),
+    else_=2
+)
+
+def _encode_idea_cursor(idea: Idea) -> str:
+    rank = {"pending": 0, "accepted": 1}.get(idea.status, 2)
+    raw = f"{rank}|{idea.created_at.isoformat()}|{idea.idea_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_idea_cursor(cursor: str):
+    try:
+        rank, created_at, idea_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return int(rank), datetime.fromisoformat(created_at), int(idea_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
 @router.get("/ideas", response_model=List[IdeaResponse])
 def get_all_ideas_admin(
+    response: Response,
     status_filter: Optional[str] = Query(None, regex="^(pending|accepted|rejected)$"),
     limit: int = Query(100, le=200),
-    skip: int = Query(0),
-    current_user: User = Depends(deps.get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
-    """Get all ideas for admin moderation."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view all ideas"
-        )
-    
-    query = db.query(Idea).options(joinedload(Idea.submitted_by_user))
+    """Get all ideas for admin moderation, keyset-paginated."""
+    query = db.query(Idea).options(selectinload(Idea.submitted_by_user))
     
     if status_filter:
         query = query.filter(Idea.status == status_filter)
     
+    # Seek past the last row of the previous page instead of OFFSET-scanning
+    if cursor:
+        rank, created_at, idea_id = _decode_idea_cursor(cursor)
+        query = query.filter(
+            or_(
+                IDEA_STATUS_RANK > rank,
+                and_(
+                    IDEA_STATUS_RANK == rank,
+                    tuple_(Idea.created_at, Idea.idea_id) < tuple_(created_at, idea_id)
+                )
+            )
+        )
+    
     # Order by status (pending first), then by creation date (newest first)
-    # Use a simpler approach without case statement
     ideas = query.order_by(
-        (Idea.status != 'pending').asc(),
-        (Idea.status != 'accepted').asc(), 
-        desc(Idea.created_at)
-    ).offset(skip).limit(limit).all()
+        IDEA_STATUS_RANK,
+        desc(Idea.created_at),
+        desc(Idea.idea_id)
+    ).limit(limit + 1).all()
+    
+    if len(ideas) > limit:
+        ideas = ideas[:limit]
+        response.headers["X-Next-Cursor"] = _encode_idea_cursor(ideas[-1])
     
     return ideas
 
@@ -454,17 +583,11 @@ def get_all_ideas_admin(
 def update_idea_status(
     idea_id: int,
     status_data: dict,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
     db: Session = Depends(deps.get_db),
 ):
     """Update idea status (approve/reject)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can update idea status"
-        )
-    
-    idea = db.query(Idea).filter(Idea.idea_id == idea_id).first()
+    idea = db.execute(IDEA_BY_ID, {"idea_id": idea_id}).scalar_one_or_none()
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     
@@ -476,19 +599,21 @@ def update_idea_status(
         )
     
     old_status = idea.status
-    idea.status = new_status
-    idea.updated_at = func.now()
+    idea.status = new_status  # updated_at is set by the column's onupdate
     
     # If linking to a market when approving
     if "linked_market_id" in status_data and status_data["linked_market_id"]:
         # Verify the market exists
-        market = db.query(Market).filter(Market.market_id == status_data["linked_market_id"]).first()
-        if not market:
+        market_id = db.execute(
+            MARKET_ID_BY_ID, {"market_id": status_data["linked_market_id"]}
+        ).scalar_one_or_none()
+        if market_id is None:
             raise HTTPException(status_code=404, detail="Linked market not found")
         idea.linked_market_id = status_data["linked_market_id"]
     
     db.commit()
-    db.refresh(idea)
+    stats_cache.clear()
+    deps.invalidate_feed_cache()
     
     return {
         "message": f"Idea status updated from {old_status} to {new_status}",
@@ -498,36 +623,38 @@ def update_idea_status(
         "linked_market_id": idea.linked_market_id
     }
 
-@router.get("/ideas/stats")
-def get_ideas_statistics(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
-):
-    """Get comprehensive ideas statistics for admin dashboard."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view ideas statistics"
-        )
-    
-    total_ideas = db.query(Idea).count()
-    pending_ideas = db.query(Idea).filter(Idea.status == "pending").count()
-    accepted_ideas = db.query(Idea).filter(Idea.status == "accepted").count()
-    rejected_ideas = db.query(Idea).filter(Idea.status == "rejected").count()
-    
+def _compute_ideas_statistics(db: Session) -> dict:
+    """Aggregate idea moderation metrics for the admin dashboard."""
     # Ideas submitted in the last 30 days
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    recent_ideas = db.query(Idea).filter(Idea.created_at >= thirty_days_ago).count()
     
-    # Ideas with linked markets
-    linked_ideas = db.query(Idea).filter(Idea.linked_market_id.isnot(None)).count()
+    stats = db.query(
+        func.count().label("total"),
+        func.count().filter(Idea.status == "pending").label("pending"),
+        func.count().filter(Idea.status == "accepted").label("accepted"),
+        func.count().filter(Idea.status == "rejected").label("rejected"),
+        func.count().filter(Idea.created_at >= thirty_days_ago).label("recent"),
+        func.count(Idea.linked_market_id).label("linked"),  # Ideas with linked markets
+    ).select_from(Idea).one()
+    
+    reviewed_ideas = stats.total - stats.pending
     
     return {
-        "total_ideas": total_ideas,
-        "pending_ideas": pending_ideas,
-        "accepted_ideas": accepted_ideas,
-        "rejected_ideas": rejected_ideas,
-        "recent_ideas_30d": recent_ideas,
-        "linked_to_markets": linked_ideas,
-        "approval_rate": (accepted_ideas / max(1, total_ideas - pending_ideas)) * 100 if total_ideas > pending_ideas else 0
-    } 
\ No newline at end of file
+        "total_ideas": stats.total,
+        "pending_ideas": stats.pending,
+        "accepted_ideas": stats.accepted,
+        "rejected_ideas": stats.rejected,
+        "recent_ideas_30d": stats.recent,
+        "linked_to_markets": stats.linked,
+        "approval_rate": (stats.accepted / reviewed_ideas) * 100 if reviewed_ideas > 0 else 0
+    }
+
+@router.get("/ideas/stats")
+def get_ideas_statistics(
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
+    db: Session = Depends(deps.get_db),
+):
+    """Get comprehensive ideas statistics for admin dashboard."""
+    return stats_cache.get_or_set(
+        "ideas_stats", lambda: _compute_ideas_statistics(db), ttl=STATS_TTL["ideas_stats"]
+    )
@@ -1,28 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.core import security
 from app.core.email import send_verification_email
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, UserResponse, Token, VerificationResponse
+import logging
 import secrets
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-@router.post("/register", response_model=UserResponse)
-def register(user_in: UserCreate, db: Session = Depends(deps.get_db)):
-    # Check if user exists
-    if db.query(User).filter(User.email == user_in.email).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    if db.query(User).filter(User.username == user_in.username).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
-        )
-    
+# HTTP-only session cookie: 7 days, all paths, SameSite=lax against CSRF.
+# Not Secure, since development runs over plain HTTP. Pre-rendered so login
+# only formats the token in.
+TOKEN_COOKIE = "token={token}; HttpOnly; Max-Age=604800; Path=/; SameSite=lax"
+
+def _create_user(db: Session, user_in: UserCreate, hashed_password: str) -> User:
     # Create verification token
     verification_token = secrets.token_urlsafe(32)
     
@@ -30,31 +28,57 @@ def register(user_in: UserCreate, db: Session = Depends(deps.get_db)):
     user = User(
         email=user_in.email,
         username=user_in.username,
-        hashed_password=security.get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         verification_token=verification_token
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
     
     # Send verification email (disabled for development)
     # send_verification_email(user.email, verification_token)
     
-    # Auto-verify for development
+    # Auto-verify for development (applied before the INSERT so it's a single write)
     user.is_verified = True
     user.verification_token = None
-    db.commit()
+    
+    # Rely on the unique indexes (users.email/username and their lower() variants)
+    # instead of a pre-check, so the happy path is a single INSERT
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        constraint = getattr(getattr(e.orig, "diag", None), "constraint_name", None) or str(e.orig)
+        if "email" in constraint:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        if "username" in constraint:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken"
+            )
+        raise
     
     return user
 
-@router.post("/login")
-def login(
+@router.post("/register", response_model=UserResponse)
+async def register(user_in: UserCreate, db: Session = Depends(deps.get_db)):
+    # bcrypt runs on the hash pool; the INSERT runs on the request threadpool
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    return await run_in_threadpool(_create_user, db, user_in, hashed_password)
+
+def _get_login_credentials(db: Session, email: str):
+    # Only the columns needed to check credentials and issue the token
+    return db.query(User.email, User.hashed_password).filter(User.email == email).first()
+
+@router.post("/login", status_code=status.HTTP_204_NO_CONTENT)
+async def login(
     user_in: UserLogin,
     response: Response,
     db: Session = Depends(deps.get_db)
 ):
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if not user or not security.verify_password(user_in.password, user.hashed_password):
+    user = await run_in_threadpool(_get_login_credentials, db, user_in.email)
+    if not user or not await security.verify_password_async(user_in.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -70,25 +94,18 @@ def login(
         access_token = security.create_access_token(subject=user.email)
         
         # Set HTTP-only cookie
-        response.set_cookie(
-            key="token",
-            value=access_token,
-            httponly=True,
-            secure=False,  # Set to False for development (HTTP)
-            samesite="lax",  # Protect against CSRF
-            max_age=7 * 24 * 60 * 60,  # 7 days
-            path="/"  # Cookie is available for all paths
+        response.raw_headers.append(
+            (b"set-cookie", TOKEN_COOKIE.format(token=access_token).encode("latin-1"))
         )
-        
-        return {"message": "Successfully logged in"}
-    except Exception as e:
-        print(f"Login error: {e}")
+
+    except Exception:
+        logger.exception("Login failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Login failed: {str(e)}"
+            detail="Login failed"
         )
 
-@router.post("/logout")
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 def logout(response: Response):
     response.delete_cookie(
         key="token",
@@ -97,19 +114,23 @@ def logout(response: Response):
         samesite="lax",
         path="/"
     )
-    return {"message": "Successfully logged out"}
 
 @router.get("/verify-email/{token}", response_model=VerificationResponse)
 def verify_email(token: str, db: Session = Depends(deps.get_db)):
-    user = db.query(User).filter(User.verification_token == token).first()
+    # Verify and consume the token in one UPDATE instead of loading the user first
+    user = db.execute(
+        update(User)
+        .where(User.verification_token == token)
+        .values(is_verified=True, verification_token=None)
+        .returning(User.user_id)
+        .execution_options(synchronize_session=False)
+    ).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid verification token"
         )
     
-    user.is_verified = True
-    user.verification_token = None
     db.commit()
     
     return {"message": "Email verified successfully"} 
\ No newline at end of file
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func
-from typing import List, Optional
+import base64
+from operator import attrgetter
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from sqlalchemy import desc, func, exists, select, text, update, tuple_
+from typing import List, Optional, Tuple
 
 from app.api import deps
 from app.models.idea import Idea
@@ -10,80 +13,200 @@ from app.models.idea_comment import IdeaComment
 from app.models.idea_bookmark import IdeaBookmark
 from app.models.user import User
 from app.schemas.idea import (
-    IdeaResponse, IdeaCreate, IdeaUpdate, IdeaDetailResponse,
+    FeedFilter, IdeaResponse, IdeaCreate, IdeaUpdate, IdeaDetailResponse,
     IdeaCommentCreate, IdeaCommentResponse, IdeaLikeResponse, IdeaBookmarkResponse
 )
 
 router = APIRouter()
 
+# Like/bookmark toggles in one round-trip: insert the row if absent, otherwise
+# delete it, and (for likes) adjust the counter atomically in the same statement.
+# The EXISTS guard on ideas turns a missing idea into an empty result.
+TOGGLE_LIKE = text("""
+    WITH ins AS (
+        INSERT INTO idea_likes (user_id, idea_id)
+        SELECT :user_id, :idea_id WHERE EXISTS (SELECT 1 FROM ideas WHERE idea_id = :idea_id)
+        ON CONFLICT (user_id, idea_id) DO NOTHING
+        RETURNING 1
+    ), del AS (
+        DELETE FROM idea_likes
+        WHERE user_id = :user_id AND idea_id = :idea_id AND NOT EXISTS (SELECT 1 FROM ins)
+        RETURNING 1
+    )
+    UPDATE ideas
+    SET likes_count = GREATEST(0, COALESCE(likes_count, 0) + (SELECT count(*) FROM ins) - (SELECT count(*) FROM del))
+    WHERE idea_id = :idea_id
+    RETURNING likes_count, EXISTS (SELECT 1 FROM ins) AS is_liked
+""")
+TOGGLE_BOOKMARK = text("""
+    WITH ins AS (
+        INSERT INTO idea_bookmarks (user_id, idea_id)
+        SELECT :user_id, :idea_id WHERE EXISTS (SELECT 1 FROM ideas WHERE idea_id = :idea_id)
+        ON CONFLICT (user_id, idea_id) DO NOTHING
+        RETURNING 1
+    ), del AS (
+        DELETE FROM idea_bookmarks
+        WHERE user_id = :user_id AND idea_id = :idea_id AND NOT EXISTS (SELECT 1 FROM ins)
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM ins) AS is_bookmarked
+    FROM ideas WHERE idea_id = :idea_id
+""")
+
+# Home/trending pages are the same for every viewer; cache them briefly in
+# deps.feed_cache (keyed by filter, cursor and limit) and overlay each viewer's
+# like/bookmark flags per request
+SHARED_FEEDS = (FeedFilter.HOME, FeedFilter.TRENDING)
+
+def _viewer_flags(user_id: int):
+    """Correlated EXISTS columns telling whether the viewer liked/bookmarked each idea."""
+    is_liked = exists().where(
+        IdeaLike.user_id == user_id,
+        IdeaLike.idea_id == Idea.idea_id
+    ).correlate(Idea).label("is_liked")
+    is_bookmarked = exists().where(
+        IdeaBookmark.user_id == user_id,
+        IdeaBookmark.idea_id == Idea.idea_id
+    ).correlate(Idea).label("is_bookmarked")
+    return is_liked, is_bookmarked
+
+# Idea columns every idea response carries, in one place for the feed select
+# and the response dicts
+IDEA_FIELDS = (
+    "idea_id", "title", "description", "submitted_by", "created_at", "updated_at",
+    "status", "linked_market_id", "likes_count", "comments_count",
+)
+_get_idea_fields = attrgetter(*IDEA_FIELDS)
+
+def _feed_select(*extra_columns):
+    """Flat idea + author columns for feed entries, read as plain rows without ORM hydration."""
+    return select(
+        *(getattr(Idea, field) for field in IDEA_FIELDS),
+        User.user_id.label("author_id"),
+        User.username.label("author_username"),
+        User.profile_picture.label("author_profile_picture"),
+        *extra_columns
+    ).select_from(Idea).outerjoin(User, Idea.submitted_by == User.user_id)
+
+def _author(user_id: int, username: str, profile_picture: Optional[str]) -> dict:
+    return {"user_id": user_id, "username": username, "profile_picture": profile_picture}
+
+def _idea_summary(row) -> dict:
+    """Viewer-independent fields of a feed entry."""
+    summary = dict(zip(IDEA_FIELDS, _get_idea_fields(row)))
+    summary["submitted_by_user"] = _author(
+        row.author_id, row.author_username, row.author_profile_picture
+    ) if row.author_id is not None else None
+    return summary
+
+def _encode_feed_cursor(entry: dict) -> str:
+    raw = f"{entry['likes_count'] or 0}|{entry['created_at'].isoformat()}|{entry['idea_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_feed_cursor(cursor: str):
+    try:
+        likes_count, created_at, idea_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return int(likes_count), datetime.fromisoformat(created_at), int(idea_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _seek(stmt, filter_type: FeedFilter, cursor: Optional[str]):
+    """Order a feed newest first (trending: most liked first) and seek past the cursor."""
+    if filter_type is FeedFilter.TRENDING:
+        keys = (Idea.likes_count, Idea.created_at, Idea.idea_id)
+    else:
+        keys = (Idea.created_at, Idea.idea_id)
+    if cursor:
+        likes_count, created_at, idea_id = _decode_feed_cursor(cursor)
+        values = (likes_count, created_at, idea_id)[-len(keys):]
+        stmt = stmt.where(tuple_(*keys) < tuple_(*values))
+    return stmt.order_by(*(desc(key) for key in keys))
+
+def _paginate(entries: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """Trim a limit + 1 fetch to the page and the cursor for the next one, if any."""
+    if len(entries) > limit:
+        entries = entries[:limit]
+        return entries, _encode_feed_cursor(entries[-1])
+    return entries, None
+
+def _load_shared_feed(db: Session, filter_type: FeedFilter, cursor: Optional[str], limit: int):
+    stmt = _seek(_feed_select(), filter_type, cursor).limit(limit + 1)
+    return _paginate([_idea_summary(row) for row in db.execute(stmt)], limit)
+
 @router.get("/", response_model=List[IdeaResponse])
 def get_ideas(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
-    skip: int = 0,
-    limit: int = 20,
-    filter_type: str = Query("home", regex="^(home|trending|bookmarked|replies|following)$"),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    filter_type: FeedFilter = FeedFilter.HOME,
 ):
-    """Get ideas with different filters for market builder forum"""
-    query = db.query(Idea).options(joinedload(Idea.submitted_by_user))
+    """Get ideas with different filters for market builder forum, keyset-paginated."""
+    if filter_type in SHARED_FEEDS:
+        page, next_cursor = deps.feed_cache.get_or_set(
+            (filter_type, cursor, limit),
+            lambda: _load_shared_feed(db, filter_type, cursor, limit)
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if not page:
+            return []
+        
+        # Overlay the viewer's flags with one primary-key lookup for the page
+        flags = {
+            row.idea_id: row for row in db.query(
+                Idea.idea_id, *_viewer_flags(current_user.user_id)
+            ).filter(Idea.idea_id.in_([idea["idea_id"] for idea in page]))
+        }
+        result = []
+        for idea in page:
+            row = flags.get(idea["idea_id"])
+            result.append({
+                **idea,
+                "is_liked": bool(row and row.is_liked),
+                "is_bookmarked": bool(row and row.is_bookmarked),
+            })
+        return result
     
-    if filter_type == "trending":
-        # Sort by likes count and recent activity
-        query = query.order_by(desc(Idea.likes_count), desc(Idea.created_at))
-    elif filter_type == "bookmarked":
+    # Ideas and the viewer's like/bookmark flags in a single statement
+    stmt = _feed_select(*_viewer_flags(current_user.user_id))
+    
+    # Semi-joins via IN (subquery) so each idea appears once, however many
+    # times the user bookmarked or commented on it
+    if filter_type is FeedFilter.BOOKMARKED:
         # Only show bookmarked ideas for current user
-        query = query.join(IdeaBookmark).filter(IdeaBookmark.user_id == current_user.user_id)
-    elif filter_type == "replies":
+        stmt = stmt.where(Idea.idea_id.in_(
+            select(IdeaBookmark.idea_id).where(IdeaBookmark.user_id == current_user.user_id)
+        ))
+    elif filter_type is FeedFilter.REPLIES:
         # Show ideas where user has commented
-        query = query.join(IdeaComment).filter(IdeaComment.user_id == current_user.user_id)
-    elif filter_type == "following":
+        stmt = stmt.where(Idea.idea_id.in_(
+            select(IdeaComment.idea_id).where(IdeaComment.user_id == current_user.user_id)
+        ))
+    else:  # following
         # Show ideas from users that current user follows
         from app.models.user_follow import UserFollow
-        query = query.join(UserFollow, Idea.submitted_by == UserFollow.following_id).filter(
+        stmt = stmt.join(UserFollow, Idea.submitted_by == UserFollow.following_id).where(
             UserFollow.follower_id == current_user.user_id
-        ).order_by(desc(Idea.created_at))
-    else:  # home
-        query = query.order_by(desc(Idea.created_at))
+        )
     
-    ideas = query.offset(skip).limit(limit).all()
+    rows = db.execute(_seek(stmt, filter_type, cursor).limit(limit + 1))
     
     # Add user-specific data (is_liked, is_bookmarked)
-    result = []
-    for idea in ideas:
-        idea_dict = {
-            "idea_id": idea.idea_id,
-            "title": idea.title,
-            "description": idea.description,
-            "submitted_by": idea.submitted_by,
-            "created_at": idea.created_at,
-            "updated_at": idea.updated_at,
-            "status": idea.status,
-            "linked_market_id": idea.linked_market_id,
-            "likes_count": idea.likes_count,
-            "comments_count": idea.comments_count,
-            "submitted_by_user": {
-                "user_id": idea.submitted_by_user.user_id,
-                "username": idea.submitted_by_user.username,
-                "profile_picture": idea.submitted_by_user.profile_picture
-            } if idea.submitted_by_user else None,
-            "is_liked": db.query(IdeaLike).filter(
-                IdeaLike.user_id == current_user.user_id,
-                IdeaLike.idea_id == idea.idea_id
-            ).first() is not None,
-            "is_bookmarked": db.query(IdeaBookmark).filter(
-                IdeaBookmark.user_id == current_user.user_id,
-                IdeaBookmark.idea_id == idea.idea_id
-            ).first() is not None,
-        }
-        result.append(idea_dict)
-    
-    return result
+    page, next_cursor = _paginate([
+        {**_idea_summary(row), "is_liked": row.is_liked, "is_bookmarked": row.is_bookmarked}
+        for row in rows
+    ], limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return page
 
 @router.post("/", response_model=IdeaResponse)
 def create_idea(
     idea_in: IdeaCreate,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Create a new idea"""
     idea = Idea(
@@ -92,85 +215,58 @@ def create_idea(
         submitted_by=current_user.user_id,
     )
     db.add(idea)
-    db.commit()
-    db.refresh(idea)
-    
-    # Load the user relationship
-    idea = db.query(Idea).options(joinedload(Idea.submitted_by_user)).filter(Idea.idea_id == idea.idea_id).first()
-    
-    return {
-        "idea_id": idea.idea_id,
-        "title": idea.title,
-        "description": idea.description,
-        "submitted_by": idea.submitted_by,
-        "created_at": idea.created_at,
-        "updated_at": idea.updated_at,
-        "status": idea.status,
-        "linked_market_id": idea.linked_market_id,
-        "likes_count": idea.likes_count,
-        "comments_count": idea.comments_count,
-        "submitted_by_user": {
-            "user_id": idea.submitted_by_user.user_id,
-            "username": idea.submitted_by_user.username,
-            "profile_picture": idea.submitted_by_user.profile_picture
-        } if idea.submitted_by_user else None,
+    # The INSERT returns the generated id and server defaults; build the
+    # response from them and current_user before commit expires the instance
+    db.flush()
+    response = {
+        **dict(zip(IDEA_FIELDS, _get_idea_fields(idea))),
+        "submitted_by_user": _author(
+            current_user.user_id, current_user.username, current_user.profile_picture
+        ),
         "is_liked": False,
         "is_bookmarked": False,
     }
+    db.commit()
+    deps.invalidate_feed_cache()
+    
+    return response
 
 @router.get("/{idea_id}", response_model=IdeaDetailResponse)
 def get_idea(
     idea_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Get a specific idea with comments"""
-    idea = db.query(Idea).options(
-        joinedload(Idea.submitted_by_user),
-        joinedload(Idea.comments).joinedload(IdeaComment.user)
-    ).filter(Idea.idea_id == idea_id).first()
+    row = db.execute(
+        _feed_select(*_viewer_flags(current_user.user_id)).where(Idea.idea_id == idea_id)
+    ).first()
     
-    if not idea:
+    if not row:
         raise HTTPException(status_code=404, detail="Idea not found")
     
+    comment_rows = db.execute(
+        select(
+            IdeaComment.comment_id, IdeaComment.content, IdeaComment.created_at,
+            User.user_id, User.username, User.profile_picture
+        ).join(User, IdeaComment.user_id == User.user_id).where(IdeaComment.idea_id == idea_id)
+    )
+    
     # Format comments
-    comments = []
-    for comment in idea.comments:
-        comments.append({
+    comments = [
+        {
             "comment_id": comment.comment_id,
             "content": comment.content,
             "created_at": comment.created_at,
-            "user": {
-                "user_id": comment.user.user_id,
-                "username": comment.user.username,
-                "profile_picture": comment.user.profile_picture
-            }
-        })
+            "user": _author(comment.user_id, comment.username, comment.profile_picture)
+        }
+        for comment in comment_rows
+    ]
     
     return {
-        "idea_id": idea.idea_id,
-        "title": idea.title,
-        "description": idea.description,
-        "submitted_by": idea.submitted_by,
-        "created_at": idea.created_at,
-        "updated_at": idea.updated_at,
-        "status": idea.status,
-        "linked_market_id": idea.linked_market_id,
-        "likes_count": idea.likes_count,
-        "comments_count": idea.comments_count,
-        "submitted_by_user": {
-            "user_id": idea.submitted_by_user.user_id,
-            "username": idea.submitted_by_user.username,
-            "profile_picture": idea.submitted_by_user.profile_picture
-        } if idea.submitted_by_user else None,
-        "is_liked": db.query(IdeaLike).filter(
-            IdeaLike.user_id == current_user.user_id,
-            IdeaLike.idea_id == idea.idea_id
-        ).first() is not None,
-        "is_bookmarked": db.query(IdeaBookmark).filter(
-            IdeaBookmark.user_id == current_user.user_id,
-            IdeaBookmark.idea_id == idea.idea_id
-        ).first() is not None,
+        **_idea_summary(row),
+        "is_liked": row.is_liked,
+        "is_bookmarked": row.is_bookmarked,
         "comments": comments
     }
 
@@ -178,67 +274,33 @@ def get_idea(
 def toggle_like(
     idea_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Toggle like on an idea"""
-    idea = db.query(Idea).filter(Idea.idea_id == idea_id).first()
-    if not idea:
+    row = db.execute(TOGGLE_LIKE, {"user_id": current_user.user_id, "idea_id": idea_id}).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Idea not found")
-    
-    existing_like = db.query(IdeaLike).filter(
-        IdeaLike.user_id == current_user.user_id,
-        IdeaLike.idea_id == idea_id
-    ).first()
-    
-    if existing_like:
-        # Unlike
-        db.delete(existing_like)
-        idea.likes_count = max(0, idea.likes_count - 1)
-        is_liked = False
-    else:
-        # Like
-        like = IdeaLike(user_id=current_user.user_id, idea_id=idea_id)
-        db.add(like)
-        idea.likes_count += 1
-        is_liked = True
-    
     db.commit()
     
     return {
-        "is_liked": is_liked,
-        "likes_count": idea.likes_count
+        "is_liked": row.is_liked,
+        "likes_count": row.likes_count
     }
 
 @router.post("/{idea_id}/bookmark", response_model=IdeaBookmarkResponse)
 def toggle_bookmark(
     idea_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Toggle bookmark on an idea"""
-    idea = db.query(Idea).filter(Idea.idea_id == idea_id).first()
-    if not idea:
+    row = db.execute(TOGGLE_BOOKMARK, {"user_id": current_user.user_id, "idea_id": idea_id}).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Idea not found")
-    
-    existing_bookmark = db.query(IdeaBookmark).filter(
-        IdeaBookmark.user_id == current_user.user_id,
-        IdeaBookmark.idea_id == idea_id
-    ).first()
-    
-    if existing_bookmark:
-        # Remove bookmark
-        db.delete(existing_bookmark)
-        is_bookmarked = False
-    else:
-        # Add bookmark
-        bookmark = IdeaBookmark(user_id=current_user.user_id, idea_id=idea_id)
-        db.add(bookmark)
-        is_bookmarked = True
-    
     db.commit()
     
     return {
-        "is_bookmarked": is_bookmarked
+        "is_bookmarked": row.is_bookmarked
     }
 
 @router.post("/{idea_id}/comments", response_model=IdeaCommentResponse)
@@ -246,11 +308,18 @@ def create_comment(
     idea_id: int,
     comment_in: IdeaCommentCreate,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Create a comment on an idea"""
-    idea = db.query(Idea).filter(Idea.idea_id == idea_id).first()
-    if not idea:
+    # Bump the counter atomically; no row back means the idea doesn't exist
+    updated = db.execute(
+        update(Idea)
+        .where(Idea.idea_id == idea_id)
+        .values(comments_count=func.coalesce(Idea.comments_count, 0) + 1)
+        .returning(Idea.idea_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if not updated:
         raise HTTPException(status_code=404, detail="Idea not found")
     
     comment = IdeaComment(
@@ -259,25 +328,14 @@ def create_comment(
         content=comment_in.content
     )
     db.add(comment)
+    db.flush()
     
-    # Update comments count
-    idea.comments_count += 1
-    
-    db.commit()
-    db.refresh(comment)
-    
-    # Load user relationship
-    comment = db.query(IdeaComment).options(joinedload(IdeaComment.user)).filter(
-        IdeaComment.comment_id == comment.comment_id
-    ).first()
-    
-    return {
+    response = {
         "comment_id": comment.comment_id,
         "content": comment.content,
         "created_at": comment.created_at,
-        "user": {
-            "user_id": comment.user.user_id,
-            "username": comment.user.username,
-            "profile_picture": comment.user.profile_picture
-        }
-    } 
\ No newline at end of file
+        "user": _author(current_user.user_id, current_user.username, current_user.profile_picture)
+    }
+    db.commit()
+    
+    return response
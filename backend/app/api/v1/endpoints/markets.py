@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
 from datetime import datetime, timezone
-from sqlalchemy import and_, or_
+from collections import defaultdict
+from sqlalchemy import and_, or_, func, exists, insert, select, text
+from pydantic import TypeAdapter, ValidationError
 import logging
+import orjson
 import os
+import re
+import shutil
 import uuid
 from pathlib import Path
 
@@ -15,9 +21,9 @@ from app.models.contract import Contract
 from app.models.market_bookmark import MarketBookmark
 from app.models.order import Order
 from app.models.position import Position
-from app.models.user import User
 from app.schemas.market import MarketResponse, MarketCreate, MarketUpdate, ContractResponse
 from app.schemas.order import OrderCreate, OrderResponse
+from app.core.cache import TTLCache
 from app.core.trading_engine import TradingEngine
 from app.models.trade import Trade
 
@@ -25,21 +31,67 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/upload-image")
-async def upload_market_image(
-    image: UploadFile = File(...),
-    current_user: User = Depends(deps.get_current_user),
-):
-    """
-    Upload a market image (admin only).
-    Returns the image URL that can be used in market creation/update.
-    """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can upload market images"
-        )
-    
+# Bookmark toggle in one round-trip: insert if absent, otherwise delete. The
+# EXISTS guard on markets turns a missing market into an empty result.
+TOGGLE_MARKET_BOOKMARK = text("""
+    WITH ins AS (
+        INSERT INTO market_bookmarks (user_id, market_id)
+        SELECT :user_id, :market_id WHERE EXISTS (SELECT 1 FROM markets WHERE market_id = :market_id)
+        ON CONFLICT (user_id, market_id) DO NOTHING
+        RETURNING 1
+    ), del AS (
+        DELETE FROM market_bookmarks
+        WHERE user_id = :user_id AND market_id = :market_id AND NOT EXISTS (SELECT 1 FROM ins)
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM ins) AS is_bookmarked
+    FROM markets WHERE market_id = :market_id
+""")
+
+# Resolves every contract of a market and closes their resting orders in one
+# round-trip, returning how many rows of each were touched
+RESOLVE_MARKET_CONTRACTS = text("""
+    WITH resolved AS (
+        UPDATE contracts SET status = 'resolved', resolution = :result
+        WHERE market_id = :market_id
+        RETURNING contract_id
+    ), closed AS (
+        UPDATE orders SET status = 'market_closed'
+        WHERE contract_id IN (SELECT contract_id FROM resolved)
+          AND status IN ('open', 'partially_filled')
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM resolved) AS contracts_resolved,
+           (SELECT count(*) FROM closed) AS affected_orders
+""")
+
+# ISO 8601 form fields (including a trailing "Z") are parsed by pydantic-core's
+# native datetime parser
+_validate_datetime = TypeAdapter(datetime).validate_python
+# Leading YYYY-MM-DD, which rules out the numeric strings pydantic would
+# otherwise accept as Unix timestamps
+ISO_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 datetime string, raising ValueError for anything else."""
+    if not ISO_DATE_PREFIX.match(value):
+        raise ValueError("expected an ISO 8601 datetime")
+    try:
+        return _validate_datetime(value)
+    except ValidationError as e:
+        raise ValueError(e.errors()[0]['msg']) from None
+
+# Market images are served from here via the /uploads static mount
+UPLOAD_DIR = Path("uploads/market_images")
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+ALLOWED_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp"}
+
+# Uploads are copied to disk in fixed-size chunks rather than read whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def _save_upload(image: UploadFile) -> str:
+    """Validate an uploaded market image, store it and return its URL."""
     # Validate file type
     if not image.content_type or not image.content_type.startswith('image/'):
         raise HTTPException(
@@ -48,26 +100,29 @@ async def upload_market_image(
         )
     
     # Validate file size (10MB limit)
-    if image.size and image.size > 10 * 1024 * 1024:
+    if image.size and image.size > MAX_IMAGE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File size must be under 10MB"
         )
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = Path("uploads/market_images")
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    # Validate extension (files without one are stored as .jpg)
+    _, dot, file_extension = (image.filename or "").rpartition('.')
+    file_extension = file_extension.lower() if dot else 'jpg'
+    if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image must be a JPG, PNG, GIF or WebP file"
+        )
     
     # Generate unique filename
-    file_extension = image.filename.split('.')[-1] if image.filename else 'jpg'
     filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = upload_dir / filename
+    file_path = UPLOAD_DIR / filename
     
     # Save file
     try:
         with open(file_path, "wb") as buffer:
-            content = await image.read()
-            buffer.write(content)
+            shutil.copyfileobj(image.file, buffer, UPLOAD_CHUNK_SIZE)
         logger.info(f"Saved market image: {file_path}")
     except Exception as e:
         logger.error(f"Failed to save market image: {e}")
@@ -76,31 +131,93 @@ async def upload_market_image(
             detail="Failed to save image"
         )
     
-    # Return the image URL
-    image_url = f"/uploads/market_images/{filename}"
-    return {"image_url": image_url}
+    return f"/uploads/market_images/{filename}"
 
-@router.get("/search", response_model=List[dict])
-def search_markets(
-    q: str = Query(..., min_length=1, max_length=100),
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
-    limit: int = Query(10, le=20),
+@router.post("/upload-image")
+def upload_market_image(
+    image: UploadFile = File(...),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
-    Search for markets by title, description, and category with fuzzy matching.
+    Upload a market image (admin only).
+    Returns the image URL that can be used in market creation/update.
     """
-    logger.info(f"Searching for markets with query: '{q}'")
-    # Search in both title and category with case-insensitive partial matching
-    markets = db.query(Market).options(joinedload(Market.contracts)).filter(
-        or_(
-            Market.title.ilike(f"%{q}%"),
-            Market.description.ilike(f"%{q}%"),
-            Market.category.ilike(f"%{q}%")
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can upload market images"
         )
-    ).filter(
-        Market.status.in_(["open", "closed"])  # Don't show cancelled markets
-    ).limit(limit).all()
+    
+    # Return the image URL
+    return {"image_url": _save_upload(image)}
+
+# Serialized price-history JSON per market. Charts are the same for every
+# viewer; placing an order on the market evicts its entry, so the TTL only
+# bounds other paths (e.g. cancellations)
+price_history_cache = TTLCache(maxsize=256, ttl=5)
+
+# Search results carry no per-viewer fields, so repeated (typeahead) queries
+# are shared across users; keyed by lowercased query and limit
+search_cache = TTLCache(maxsize=512, ttl=60)
+
+def invalidate_search_cache() -> None:
+    """Drop cached search results after a market is created or changes status."""
+    search_cache.clear()
+
+def _relevance_score(market: Market, query_lower: str) -> int:
+    """Rank a search hit against an already-lowercased query; lower is better."""
+    title_lower = market.title.lower()
+    
+    # Exact title match
+    if title_lower == query_lower:
+        return 0
+    # Title starts with query
+    if title_lower.startswith(query_lower):
+        return 1
+    
+    category_lower = (market.category or "").lower()
+    # Category exact match
+    if category_lower == query_lower:
+        return 2
+    # Title contains query
+    if query_lower in title_lower:
+        return 3
+    # Description contains query
+    if query_lower in (market.description or "").lower():
+        return 4
+    # Category contains query
+    if query_lower in category_lower:
+        return 5
+    return 6
+
+def _search_markets(db: Session, q: str, limit: int) -> List[dict]:
+    logger.info(f"Searching for markets with query: '{q}'")
+    query_lower = q.lower()
+    searchable = Market.status.in_(["open", "closed"])  # Don't show cancelled markets
+    
+    # Exact and prefix title matches first, from the lower(title) B-tree index
+    markets = db.query(Market).filter(
+        func.lower(Market.title).startswith(query_lower, autoescape=True),
+        searchable
+    ).order_by(func.lower(Market.title)).limit(limit).all()
+    
+    if len(markets) < limit:
+        # Fill the rest with full-text matches on title, description and category,
+        # plus case-insensitive partial matching for word fragments (both served
+        # by GIN indexes)
+        ts_query = func.plainto_tsquery("english", q)
+        markets += db.query(Market).filter(
+            or_(
+                Market.search_tsv.op("@@")(ts_query),
+                Market.title.ilike(f"%{q}%"),
+                Market.description.ilike(f"%{q}%"),
+                Market.category.ilike(f"%{q}%")
+            ),
+            searchable,
+            Market.market_id.notin_([market.market_id for market in markets])
+        ).order_by(
+            func.ts_rank_cd(Market.search_tsv, ts_query).desc(), Market.market_id
+        ).limit(limit - len(markets)).all()
     
     logger.info(f"Found {len(markets)} markets in DB for query '{q}'")
     
@@ -111,49 +228,26 @@ def search_markets(
         logger.info("No markets found in the database for the query.")
 
     # Sort by relevance
-    def relevance_score(market):
-        title_lower = market.title.lower()
-        description_lower = (market.description or "").lower()
-        category_lower = (market.category or "").lower()
-        query_lower = q.lower()
-        
-        # Exact title match
-        if title_lower == query_lower:
-            return 0
-        # Title starts with query
-        elif title_lower.startswith(query_lower):
-            return 1
-        # Category exact match
-        elif category_lower == query_lower:
-            return 2
-        # Title contains query
-        elif query_lower in title_lower:
-            return 3
-        # Description contains query
-        elif query_lower in description_lower:
-            return 4
-        # Category contains query
-        elif query_lower in category_lower:
-            return 5
-        else:
-            return 6
-    
-    markets.sort(key=relevance_score)
+    markets.sort(key=lambda market: _relevance_score(market, query_lower))
     
     # Log titles after sorting
     if markets:
         logger.info(f"Market titles after sorting: {[m.title for m in markets]}")
 
+    # Trade counts across all contracts (both YES and NO sides) of every
+    # matched market, in one grouped query
+    trade_counts = {}
+    if markets:
+        trade_counts = dict(db.query(Contract.market_id, func.count(Trade.trade_id)).join(
+            Trade, Trade.contract_id == Contract.contract_id
+        ).filter(
+            Contract.market_id.in_([market.market_id for market in markets])
+        ).group_by(Contract.market_id).all())
+    
     # Get trade volume for display
     result = []
     for market in markets:
-        # Calculate total trade volume across all contracts in the market
-        total_volume = 0
-        if market.contracts:
-            for contract in market.contracts:
-                # Count all trades for this contract (both YES and NO sides)
-                trades_count = db.query(Trade).filter(Trade.contract_id == contract.contract_id).count()
-                total_volume += trades_count
+        total_volume = trade_counts.get(market.market_id, 0)
         
         result.append({
             "market_id": market.market_id,
@@ -167,8 +261,22 @@ def search_markets(
     
     return result
 
+@router.get("/search", response_model=List[dict])
+def search_markets(
+    q: str = Query(..., min_length=1, max_length=100),
+    db: Session = Depends(deps.get_db),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
+    limit: int = Query(10, le=20),
+):
+    """
+    Search for markets by title, description, and category with fuzzy matching.
+    """
+    return search_cache.get_or_set(
+        (q.lower(), limit), lambda: _search_markets(db, q, limit)
+    )
+
 @router.post("/", response_model=MarketResponse)
-async def create_market(
+def create_market(
     title: str = Form(...),
     description: str = Form(""),
     category: str = Form(...),
@@ -177,7 +285,7 @@ async def create_market(
     resolve_time: str = Form(""),
     image: Optional[UploadFile] = File(None),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Create a new market with image upload (admin only).
@@ -193,54 +301,19 @@ async def create_market(
     # Handle image upload
     image_url = None
     if image:
-        # Validate file type
-        if not image.content_type or not image.content_type.startswith('image/'):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File must be an image"
-            )
-        
-        # Validate file size (10MB limit)
-        if image.size and image.size > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size must be under 10MB"
-            )
-        
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("uploads/market_images")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        file_extension = image.filename.split('.')[-1] if image.filename else 'jpg'
-        filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = upload_dir / filename
-        
-        # Save file
-        try:
-            with open(file_path, "wb") as buffer:
-                content = await image.read()
-                buffer.write(content)
-            logger.info(f"Saved market image: {file_path}")
-            image_url = f"/uploads/market_images/{filename}"
-        except Exception as e:
-            logger.error(f"Failed to save market image: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to save image"
-            )
+        image_url = _save_upload(image)
     
     # Parse datetime strings
     try:
-        start_time_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        close_time_dt = datetime.fromisoformat(close_time.replace('Z', '+00:00'))
+        start_time_dt = _parse_datetime(start_time)
+        close_time_dt = _parse_datetime(close_time)
         resolve_time_dt = None
         if resolve_time:
-            resolve_time_dt = datetime.fromisoformat(resolve_time.replace('Z', '+00:00'))
+            resolve_time_dt = _parse_datetime(resolve_time)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid datetime format: {str(e)}"
+            detail=f"Invalid datetime format: {e}"
         )
     
     # Create market
@@ -267,6 +340,7 @@ async def create_market(
     db.add(default_contract)
     
     db.commit()
+    invalidate_search_cache()
     db.refresh(market)
     db.refresh(default_contract)
     
@@ -303,7 +377,7 @@ async def create_market(
 @router.get("/", response_model=List[MarketResponse])
 def read_markets(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
@@ -312,35 +386,57 @@ def read_markets(
     """
     Retrieve markets with optional filtering by category or bookmarked status.
     """
-    query = db.query(Market).options(joinedload(Market.contracts)).filter(Market.status == "open")
+    # Markets and the viewer's bookmark flag in a single statement
+    is_bookmarked = exists().where(
+        MarketBookmark.user_id == current_user.user_id,
+        MarketBookmark.market_id == Market.market_id
+    ).correlate(Market).label("is_bookmarked")
+    # Plain rows, no ORM hydration
+    stmt = select(
+        Market.market_id, Market.title, Market.description, Market.category,
+        Market.image_url, Market.start_time, Market.close_time, Market.resolve_time,
+        Market.status, Market.result, is_bookmarked
+    ).where(Market.status == "open")
     
     if category:
-        query = query.filter(Market.category == category)
+        stmt = stmt.where(Market.category == category)
     
     if bookmarked_only:
-        query = query.join(
+        stmt = stmt.join(
             MarketBookmark, Market.market_id == MarketBookmark.market_id
-        ).filter(MarketBookmark.user_id == current_user.user_id)
+        ).where(MarketBookmark.user_id == current_user.user_id)
         
-    markets = query.offset(skip).limit(limit).all()
+    markets = db.execute(stmt.offset(skip).limit(limit)).all()
     
-    # Initialize trading engine for price calculations
-    trading_engine = TradingEngine(db)
+    # Contracts for the whole page in one query
+    contracts_by_market = defaultdict(list)
+    if markets:
+        contract_rows = db.execute(
+            select(
+                Contract.contract_id, Contract.market_id, Contract.title,
+                Contract.description, Contract.status, Contract.resolution
+            ).where(Contract.market_id.in_([market.market_id for market in markets]))
+        )
+        for contract in contract_rows:
+            contract = contract._asdict()
+            contracts_by_market[contract.pop("market_id")].append(contract)
+    
+    # Best asks and volumes for every listed contract side in one pass
+    contract_stats = TradingEngine(db).get_contract_stats_bulk([
+        contract["contract_id"]
+        for market_contracts in contracts_by_market.values()
+        for contract in market_contracts
+    ])
     
     # Add bookmark status and contract info for each market
     result = []
     for market in markets:
-        is_bookmarked = db.query(MarketBookmark).filter(
-            MarketBookmark.user_id == current_user.user_id,
-            MarketBookmark.market_id == market.market_id
-        ).first() is not None
-        
         # Get contract information with real pricing from order book
         contracts = []
-        for contract in market.contracts:
+        for contract in contracts_by_market[market.market_id]:
             # Get real market statistics for both sides
-            yes_stats = trading_engine.get_contract_stats(contract.contract_id, "YES")
-            no_stats = trading_engine.get_contract_stats(contract.contract_id, "NO")
+            yes_stats = contract_stats[(contract["contract_id"], "YES")]
+            no_stats = contract_stats[(contract["contract_id"], "NO")]
             
             # Format prices using best ask prices (for YES/NO buttons)
             yes_price = "No price"
@@ -353,41 +449,25 @@ def read_markets(
             if no_stats["best_ask_price"] is not None:
                 no_price = f"{int(no_stats['best_ask_price'] * 100)}¢"
             
-            contracts.append(ContractResponse(
-                contract_id=contract.contract_id,
-                title=contract.title,
-                description=contract.description,
-                status=contract.status,
-                resolution=contract.resolution,
-                yes_price=yes_price,
-                no_price=no_price,
-                yes_volume=yes_stats['total_volume'],
-                no_volume=no_stats['total_volume']
-            ))
+            contracts.append({
+                **contract,
+                "yes_price": yes_price,
+                "no_price": no_price,
+                "yes_volume": yes_stats['total_volume'],
+                "no_volume": no_stats['total_volume']
+            })
         
-        market_dict = MarketResponse(
-            market_id=market.market_id,
-            title=market.title,
-            description=market.description,
-            category=market.category,
-            image_url=market.image_url,
-            start_time=market.start_time,
-            close_time=market.close_time,
-            resolve_time=market.resolve_time,
-            status=market.status,
-            result=market.result,
-            is_bookmarked=is_bookmarked,
-            contracts=contracts
-        )
-        result.append(market_dict)
+        result.append({**market._mapping, "contracts": contracts})
     
-    return result
+    # The dicts carry exactly the MarketResponse fields, so hand them straight to
+    # orjson; response_model stays for the OpenAPI schema only
+    return ORJSONResponse(result)
 
 @router.post("/with-contracts", response_model=MarketResponse)
 def create_market_with_contracts(
     market_in: MarketCreate,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Create a new market with contracts using JSON payload (admin only).
@@ -414,25 +494,30 @@ def create_market_with_contracts(
     db.add(market)
     db.flush()  # Get market ID
     
-    # Create contracts for each option
+    # Create contracts for each option in one multi-row INSERT ... RETURNING
     contracts = []
-    for contract_option in market_in.contracts:
-        contract = Contract(
-            market_id=market.market_id,
-            title=contract_option.title,
-            description=contract_option.description,
-            status="open"
-        )
-        db.add(contract)
-        contracts.append(contract)
+    if market_in.contracts:
+        contracts = db.execute(
+            insert(Contract).returning(
+                Contract.contract_id, Contract.title, Contract.description,
+                Contract.status, Contract.resolution,
+                sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "market_id": market.market_id,
+                    "title": contract_option.title,
+                    "description": contract_option.description,
+                    "status": "open",
+                }
+                for contract_option in market_in.contracts
+            ]
+        ).all()
     
     db.commit()
+    invalidate_search_cache()
     db.refresh(market)
     
-    # Refresh contracts to get IDs
-    for contract in contracts:
-        db.refresh(contract)
-    
     # Format response
     contract_responses = []
     for contract in contracts:
@@ -464,7 +549,7 @@ def create_market_with_contracts(
     )
 
 @router.put("/{market_id}", response_model=MarketResponse)
-async def update_market(
+def update_market(
     market_id: int,
     title: str = Form(...),
     description: str = Form(""),
@@ -474,7 +559,7 @@ async def update_market(
     resolve_time: str = Form(""),
     image: Optional[UploadFile] = File(None),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Update an existing market (admin only).
@@ -491,54 +576,19 @@ async def update_market(
     
     # Handle image upload
     if image:
-        # Validate file type
-        if not image.content_type or not image.content_type.startswith('image/'):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File must be an image"
-            )
-        
-        # Validate file size (10MB limit)
-        if image.size and image.size > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size must be under 10MB"
-            )
-        
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("uploads/market_images")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        file_extension = image.filename.split('.')[-1] if image.filename else 'jpg'
-        filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = upload_dir / filename
-        
-        # Save file
-        try:
-            with open(file_path, "wb") as buffer:
-                content = await image.read()
-                buffer.write(content)
-            logger.info(f"Saved market image: {file_path}")
-            market.image_url = f"/uploads/market_images/{filename}"
-        except Exception as e:
-            logger.error(f"Failed to save market image: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to save image"
-            )
+        market.image_url = _save_upload(image)
     
     # Parse datetime strings
     try:
-        start_time_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        close_time_dt = datetime.fromisoformat(close_time.replace('Z', '+00:00'))
+        start_time_dt = _parse_datetime(start_time)
+        close_time_dt = _parse_datetime(close_time)
         resolve_time_dt = None
         if resolve_time:
-            resolve_time_dt = datetime.fromisoformat(resolve_time.replace('Z', '+00:00'))
+            resolve_time_dt = _parse_datetime(resolve_time)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid datetime format: {str(e)}"
+            detail=f"Invalid datetime format: {e}"
         )
     
     # Update market fields
@@ -550,14 +600,17 @@ async def update_market(
     market.resolve_time = resolve_time_dt
     
     db.commit()
+    invalidate_search_cache()
     db.refresh(market)
     
     # Format the response
-    trading_engine = TradingEngine(db)
+    contract_stats = TradingEngine(db).get_contract_stats_bulk(
+        [contract.contract_id for contract in market.contracts]
+    )
     contract_responses = []
     for contract in market.contracts:
-        yes_stats = trading_engine.get_contract_stats(contract.contract_id, "YES")
-        no_stats = trading_engine.get_contract_stats(contract.contract_id, "NO")
+        yes_stats = contract_stats[(contract.contract_id, "YES")]
+        no_stats = contract_stats[(contract.contract_id, "NO")]
         
         contract_responses.append(ContractResponse(
             contract_id=contract.contract_id,
@@ -590,7 +643,7 @@ async def update_market(
 def get_market_details(
     market_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Get detailed market information including contracts and order book.
@@ -647,32 +700,38 @@ def place_order(
     market_id: int,
     order_data: OrderCreate,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Place a buy or sell order for a specific side (YES/NO) of a market contract.
     """
+    # Market and contract state in one round-trip; the contract columns are
+    # NULL when the contract doesn't belong to this market
+    row = db.execute(
+        select(Market.status, Market.close_time, Contract.status.label("contract_status"))
+        .outerjoin(Contract, and_(
+            Contract.market_id == Market.market_id,
+            Contract.contract_id == order_data.contract_id
+        ))
+        .where(Market.market_id == market_id)
+    ).first()
+    
     # Verify market exists and is open
-    market = db.query(Market).filter(Market.market_id == market_id).first()
-    if not market:
+    if not row:
         raise HTTPException(status_code=404, detail="Market not found")
     
-    if market.status != "open":
+    if row.status != "open":
         raise HTTPException(status_code=400, detail="Market is not open for trading")
     
     current_time = datetime.now(timezone.utc)
-    if current_time > market.close_time:
+    if current_time > row.close_time:
         raise HTTPException(status_code=400, detail="Market trading has closed")
     
     # Verify contract belongs to this market
-    contract = db.query(Contract).filter(
-        Contract.contract_id == order_data.contract_id,
-        Contract.market_id == market_id
-    ).first()
-    if not contract:
+    if row.contract_status is None:
         raise HTTPException(status_code=404, detail="Contract not found in this market")
     
-    if contract.status != "open":
+    if row.contract_status != "open":
         raise HTTPException(status_code=400, detail="Contract is not open for trading")
     
     try:
@@ -686,6 +745,8 @@ def place_order(
             price=order_data.price,
             quantity=order_data.quantity
         )
+        # Any trades it matched extend this market's price history
+        price_history_cache.pop(market_id)
         
         return {
             "order_id": order.order_id,
@@ -707,19 +768,17 @@ def place_order(
 def get_user_orders(
     market_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Get user's orders for a specific market.
     """
-    # Get contracts for this market
-    contracts = db.query(Contract).filter(Contract.market_id == market_id).all()
-    contract_ids = [c.contract_id for c in contracts]
-    
-    # Get user's orders for these contracts
+    # Get user's orders for this market's contracts
     orders = db.query(Order).filter(
         Order.user_id == current_user.user_id,
-        Order.contract_id.in_(contract_ids)
+        Order.contract_id.in_(
+            select(Contract.contract_id).where(Contract.market_id == market_id)
+        )
     ).order_by(Order.created_at.desc()).all()
     
     return [
@@ -742,7 +801,7 @@ def get_user_orders(
 def cancel_order(
     order_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Cancel an open order.
@@ -755,12 +814,26 @@ def cancel_order(
     
     return {"message": "Order cancelled successfully"}
 
+def _lock_market_contracts(db: Session, market_id: int) -> List[int]:
+    """
+    Lock a market's contracts (in id order) before writing the market row.
+    TradingEngine.place_order locks the contract first and only reaches the
+    markets row through the trades volume trigger, so taking the contracts
+    first here keeps the lock order the same and avoids deadlocks.
+    """
+    return db.execute(
+        select(Contract.contract_id)
+        .where(Contract.market_id == market_id)
+        .order_by(Contract.contract_id)
+        .with_for_update()
+    ).scalars().all()
+
 @router.put("/{market_id}/resolve")
 def resolve_market(
     market_id: int,
     result: str,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Resolve a market (admin only).
@@ -783,53 +856,43 @@ def resolve_market(
         raise HTTPException(status_code=400, detail="Market is already resolved")
     
     try:
+        _lock_market_contracts(db, market_id)
+        
         # Update market status
         market.status = "resolved"
         market.result = result
         market.resolve_time = datetime.now(timezone.utc)
         
-        # Get all contracts for this market
-        contracts = db.query(Contract).filter(Contract.market_id == market_id).all()
-        contract_ids = [c.contract_id for c in contracts]
+        # Resolve all contracts and cancel their open orders
+        counts = db.execute(
+            RESOLVE_MARKET_CONTRACTS, {"market_id": market_id, "result": result}
+        ).one()
         
-        if contract_ids:
-            # Cancel all open orders first
-            affected_orders = db.query(Order).filter(
-                Order.contract_id.in_(contract_ids),
-                Order.status.in_(["open", "partially_filled"])
-            ).update(
-                {"status": "market_closed"},
-                synchronize_session=False
-            )
-            
-            # Update all contracts to resolved status with the same result
-            db.query(Contract).filter(
-                Contract.contract_id.in_(contract_ids)
-            ).update(
-                {"status": "resolved", "resolution": result},
-                synchronize_session=False
-            )
-            
+        affected_positions = 0
+        if counts.contracts_resolved:
             # Commit the status changes first
             db.commit()
+            invalidate_search_cache()
             
             # Now process payouts using the trading engine
             trading_engine = TradingEngine(db)
             trading_engine.process_market_resolution(market)
             
             logger.info(f"Market {market_id} resolved with result: {result}. Payouts processed.")
-        
-        # Get final statistics
-        affected_positions = db.query(Position).filter(
-            Position.contract_id.in_(contract_ids),
-            Position.is_active == False
-        ).count() if contract_ids else 0
+            
+            # Get final statistics
+            affected_positions = db.query(func.count(Position.position_id)).join(
+                Contract, Position.contract_id == Contract.contract_id
+            ).filter(
+                Contract.market_id == market_id,
+                Position.is_active == False
+            ).scalar()
         
         return {
             "message": f"Market resolved with result: {result}. Payouts processed automatically.",
-            "affected_orders": affected_orders if contract_ids else 0,
+            "affected_orders": counts.affected_orders,
             "affected_positions": affected_positions,
-            "contracts_resolved": len(contract_ids),
+            "contracts_resolved": counts.contracts_resolved,
             "payouts_processed": True
         }
         
@@ -847,7 +910,7 @@ def resolve_contract(
     contract_id: int,
     resolution_data: dict,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Resolve an individual contract within a market (admin only).
@@ -899,18 +962,20 @@ def resolve_contract(
         trading_engine = TradingEngine(db)
         trading_engine._payout_contract(contract, result)
         
-        # Check if all contracts in the market are now resolved
-        remaining_contracts = db.query(Contract).filter(
+        # Check if all contracts in the market are now resolved (EXISTS stops
+        # at the first unresolved contract instead of counting them all)
+        has_unresolved = db.query(exists().where(
             Contract.market_id == market_id,
             Contract.status != "resolved"
-        ).count()
+        )).scalar()
         
         # If all contracts are resolved, mark the market as resolved
-        if remaining_contracts == 0:
+        if not has_unresolved:
             market.status = "resolved"
             market.resolve_time = datetime.now(timezone.utc)
             # Don't set a single market result since contracts may have different outcomes
             db.commit()
+            invalidate_search_cache()
         
         logger.info(f"Contract {contract_id} in market {market_id} resolved with result: {result}")
         
@@ -919,7 +984,7 @@ def resolve_contract(
             "affected_orders": affected_orders,
             "contract_id": contract_id,
             "resolution": result,
-            "market_fully_resolved": remaining_contracts == 0,
+            "market_fully_resolved": not has_unresolved,
             "payouts_processed": True
         }
         
@@ -935,7 +1000,7 @@ def resolve_contract(
 def close_market(
     market_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Close a market (admin only).
@@ -955,16 +1020,16 @@ def close_market(
     if market.status != "open":
         raise HTTPException(status_code=400, detail="Market is not open")
     
+    # Get (and lock) all contract ids for this market
+    contract_ids = _lock_market_contracts(db, market_id)
+    
     # Update market status
     market.status = "closed"
     
-    # Get all contracts for this market
-    contracts = db.query(Contract).filter(Contract.market_id == market_id).all()
-    contract_ids = [c.contract_id for c in contracts]
-    
+    affected_orders = 0
     if contract_ids:
         # Efficiently cancel all open orders
-        db.query(Order).filter(
+        affected_orders = db.query(Order).filter(
             Order.contract_id.in_(contract_ids),
             Order.status.in_(["open", "partially_filled"])
         ).update(
@@ -981,12 +1046,7 @@ def close_market(
         )
     
     db.commit()
-    
-    # Log the closure for debugging
-    affected_orders = db.query(Order).filter(
-        Order.contract_id.in_(contract_ids),
-        Order.status == "market_closed"
-    ).count() if contract_ids else 0
+    invalidate_search_cache()
     
     return {
         "message": "Market closed successfully",
@@ -998,91 +1058,93 @@ def close_market(
 def toggle_market_bookmark(
     market_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Toggle bookmark status for a market.
     """
-    market = db.query(Market).filter(Market.market_id == market_id).first()
-    if not market:
-        raise HTTPException(status_code=404, detail="Market not found")
-    
-    existing_bookmark = db.query(MarketBookmark).filter(
-        MarketBookmark.user_id == current_user.user_id,
-        MarketBookmark.market_id == market_id
+    row = db.execute(
+        TOGGLE_MARKET_BOOKMARK, {"user_id": current_user.user_id, "market_id": market_id}
     ).first()
-    
-    if existing_bookmark:
-        # Remove bookmark
-        db.delete(existing_bookmark)
-        is_bookmarked = False
-    else:
-        # Add bookmark
-        bookmark = MarketBookmark(user_id=current_user.user_id, market_id=market_id)
-        db.add(bookmark)
-        is_bookmarked = True
-    
+    if not row:
+        raise HTTPException(status_code=404, detail="Market not found")
     db.commit()
     
     return {
-        "is_bookmarked": is_bookmarked
+        "is_bookmarked": row.is_bookmarked
     }
 
-@router.get("/{market_id}/price-history", response_model=dict)
-def get_market_price_history(
-    market_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
-):
-    """
-    Get historical price data for all contracts in a market.
-    Returns trade data that can be used to plot price charts.
-    """
-    market = db.query(Market).filter(Market.market_id == market_id).first()
-    if not market:
+def _load_price_history(db: Session, market_id: int) -> bytes:
+    market_title = db.execute(
+        select(Market.title).where(Market.market_id == market_id)
+    ).scalar_one_or_none()
+    if market_title is None:
         raise HTTPException(status_code=404, detail="Market not found")
     
     # Get all contracts for this market
-    contracts = db.query(Contract).filter(Contract.market_id == market_id).all()
+    contracts = db.execute(
+        select(Contract.contract_id, Contract.title, Contract.description)
+        .where(Contract.market_id == market_id)
+    ).all()
+    
+    # Get trades for YES side only (since NO = 1 - YES), for every contract at once
+    trades = db.execute(
+        select(Trade.contract_id, Trade.executed_at, Trade.price, Trade.quantity)
+        .join(Order, Trade.buy_order_id == Order.order_id)
+        .join(Contract, Trade.contract_id == Contract.contract_id)
+        .where(Contract.market_id == market_id, Order.contract_side == "YES")
+        .order_by(Trade.executed_at.asc())
+    )
     
-    # Get trade data for each contract
-    contract_data = []
-    for contract in contracts:
-        # Get trades for YES side only (since NO = 1 - YES)
-        trades = db.query(Trade).join(Order, Trade.buy_order_id == Order.order_id).filter(
-            and_(
-                Trade.contract_id == contract.contract_id,
-                Order.contract_side == "YES"
-            )
-        ).order_by(Trade.executed_at.asc()).all()
-        
-        # Convert trades to price points
-        price_points = []
-        for trade in trades:
-            price_points.append({
-                "timestamp": trade.executed_at.isoformat(),
-                "price": float(trade.price),
-                "volume": trade.quantity
-            })
-        
-        contract_data.append({
+    # Convert trades to price points
+    price_points = defaultdict(list)
+    for trade in trades:
+        price_points[trade.contract_id].append({
+            "timestamp": trade.executed_at,
+            "price": float(trade.price),
+            "volume": trade.quantity
+        })
+    
+    contract_data = [
+        {
             "contract_id": contract.contract_id,
             "title": contract.title,
             "description": contract.description,
-            "price_history": price_points
-        })
+            "price_history": price_points[contract.contract_id]
+        }
+        for contract in contracts
+    ]
     
-    return {
+    # Serialized once here (orjson writes datetimes as ISO 8601) so cache hits
+    # skip validation and encoding of every price point
+    return orjson.dumps({
         "market_id": market_id,
-        "market_title": market.title,
+        "market_title": market_title,
         "contracts": contract_data
-    }
+    })
+
+@router.get("/{market_id}/price-history", response_model=dict, response_class=ORJSONResponse)
+def get_market_price_history(
+    market_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
+):
+    """
+    Get historical price data for all contracts in a market.
+    Returns trade data that can be used to plot price charts.
+    """
+    return Response(
+        content=price_history_cache.get_or_set(
+            market_id, lambda: _load_price_history(db, market_id)
+        ),
+        media_type="application/json",
+    )
 
 @router.get("/{market_id}/market-prices", response_model=dict)
 def get_market_prices(
     market_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Get current market prices (midpoint between highest YES buy and lowest YES sell) 
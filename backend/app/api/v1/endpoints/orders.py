@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 
 from app.api import deps
 from app.models.order import Order
 from app.models.contract import Contract
 from app.models.market import Market
-from app.models.user import User
 from app.schemas.order import OrderResponse
 from app.core.trading_engine import TradingEngine
 
@@ -15,7 +15,7 @@ router = APIRouter()
 @router.get("/", response_model=List[dict])
 def get_user_orders(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
     status: Optional[str] = None,
     market_id: Optional[int] = None,
     skip: int = 0,
@@ -24,8 +24,10 @@ def get_user_orders(
     """
     Get user's orders across all markets with optional filtering.
     """
+    # Load contracts/markets with IN queries keyed by the page's ids instead of
+    # widening every order row (and clashing with the market_id join below)
     query = db.query(Order).options(
-        joinedload(Order.contract).joinedload(Contract.market)
+        selectinload(Order.contract).selectinload(Contract.market)
     ).filter(
         Order.user_id == current_user.user_id,
         Order.status.in_(["open", "partially_filled"])  # Only show active orders
@@ -65,13 +67,15 @@ def get_user_orders(
             }
         })
     
-    return result
+    # Already JSON-ready (price as str, created_at handled by orjson), so skip
+    # re-validating every row against List[dict]
+    return ORJSONResponse(result)
 
 @router.delete("/{order_id}")
 def cancel_order(
     order_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Cancel a specific order.
@@ -88,7 +92,7 @@ def cancel_order(
 def get_order_details(
     order_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """
     Get details of a specific order.
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func, and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy import (
+    BigInteger, Boolean, DateTime, Integer, desc, func, and_, or_, exists, select, cast,
+    literal, literal_column, null, text, union_all
+)
 from typing import List, Optional
 
 from app.api import deps
@@ -19,88 +22,157 @@ from app.schemas.profile import (
 
 router = APIRouter()
 
+# Follows the user if not already followed, otherwise unfollows, in one
+# round-trip; the unique (follower_id, following_id) constraint makes
+# concurrent double-clicks safe. Self-follows are never written, and the
+# target's user_id is returned so the caller can reject them. The count
+# reads the pre-statement snapshot, so it is adjusted by this toggle.
+TOGGLE_USER_FOLLOW = text("""
+    WITH target AS (
+        SELECT user_id FROM users WHERE username = :username
+    ), ins AS (
+        INSERT INTO user_follows (follower_id, following_id)
+        SELECT :follower_id, user_id FROM target WHERE user_id <> :follower_id
+        ON CONFLICT (follower_id, following_id) DO NOTHING
+        RETURNING 1
+    ), del AS (
+        DELETE FROM user_follows
+        WHERE follower_id = :follower_id
+          AND following_id IN (SELECT user_id FROM target WHERE user_id <> :follower_id)
+          AND NOT EXISTS (SELECT 1 FROM ins)
+        RETURNING 1
+    )
+    SELECT target.user_id,
+           EXISTS (SELECT 1 FROM ins) AS is_following,
+           (SELECT count(*) FROM user_follows WHERE following_id = target.user_id)
+             + (SELECT count(*) FROM ins) - (SELECT count(*) FROM del) AS followers_count
+    FROM target
+""")
+
 @router.get("/{username}", response_model=UserProfileResponse)
 def get_user_profile(
     username: str,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Get user profile - returns full profile if own profile, public profile otherwise"""
-    target_user = db.query(User).filter(User.username == username).first()
-    if not target_user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # Profile row, follower/following counts, total likes received on ideas and
+    # whether the current user follows the target, in one round-trip
+    followers = select(func.count(UserFollow.follow_id)).where(
+        UserFollow.following_id == User.user_id
+    ).correlate(User).scalar_subquery()
+    following = select(func.count(UserFollow.follow_id)).where(
+        UserFollow.follower_id == User.user_id
+    ).correlate(User).scalar_subquery()
+    likes_received = select(func.coalesce(func.sum(Idea.likes_count), 0)).where(
+        Idea.submitted_by == User.user_id
+    ).correlate(User).scalar_subquery()
+    follows_target = exists().where(
+        UserFollow.follower_id == current_user.user_id,
+        UserFollow.following_id == User.user_id
+    ).correlate(User)
     
-    # Get follower/following counts
-    followers_count = db.query(UserFollow).filter(UserFollow.following_id == target_user.user_id).count()
-    following_count = db.query(UserFollow).filter(UserFollow.follower_id == target_user.user_id).count()
+    row = db.execute(
+        select(
+            User,
+            followers.label("followers_count"),
+            following.label("following_count"),
+            likes_received.label("likes_count"),
+            follows_target.label("is_following"),
+        ).where(User.username == username)
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+    target_user = row.User
+    followers_count = row.followers_count
+    following_count = row.following_count
+    likes_count = row.likes_count
     
-    # Get total likes received on ideas
-    likes_count = db.query(func.sum(Idea.likes_count)).filter(Idea.submitted_by == target_user.user_id).scalar() or 0
+    # Nobody "follows" their own profile
+    is_following = current_user.user_id != target_user.user_id and row.is_following
     
-    # Check if current user is following target user
-    is_following = False
-    if current_user.user_id != target_user.user_id:
-        is_following = db.query(UserFollow).filter(
-            UserFollow.follower_id == current_user.user_id,
-            UserFollow.following_id == target_user.user_id
-        ).first() is not None
+    is_own_profile = current_user.user_id == target_user.user_id
     
-    # Get user's active positions (bets)
-    active_positions = db.query(Position).options(
-        joinedload(Position.contract).joinedload(Contract.market)
-    ).filter(
+    # Active positions (bets), the 10 latest ideas and the 10 latest comments
+    # (replies) in one UNION ALL; "kind" tells the rows apart and columns a
+    # branch doesn't use are NULL (typed once, in the first branch)
+    no_datetime = cast(null(), DateTime(timezone=True))
+    no_int = cast(null(), Integer)
+    bets_query = select(
+        literal("bet").label("kind"),
+        Market.market_id.label("id"),
+        Contract.title.label("title"),
+        Market.title.label("text"),
+        Market.category.label("category"),
+        Position.contract_side.label("outcome"),
+        Position.quantity.label("quantity"),
+        Position.avg_price.label("avg_price"),
+        no_datetime.label("created_at"),
+        no_int.label("likes_count"),
+        no_int.label("comments_count"),
+        cast(null(), BigInteger).label("idea_id"),
+    ).select_from(Position).join(
+        Contract, Position.contract_id == Contract.contract_id
+    ).join(
+        Market, Contract.market_id == Market.market_id
+    ).where(
         Position.user_id == target_user.user_id,
         Position.quantity != 0,
         Position.is_active == True  # Only show active positions
+    )
+    ideas_query = select(
+        literal("idea"), Idea.idea_id, Idea.title, Idea.description,
+        null(), null(), null(), null(),
+        Idea.created_at, Idea.likes_count, Idea.comments_count, null(),
+    ).where(
+        Idea.submitted_by == target_user.user_id
+    ).order_by(desc(Idea.created_at)).limit(10)
+    replies_query = select(
+        literal("reply"), IdeaComment.comment_id, IdeaComment.content, Idea.title,
+        null(), null(), null(), null(),
+        IdeaComment.created_at, null(), null(), Idea.idea_id,
+    ).join(
+        Idea, IdeaComment.idea_id == Idea.idea_id
+    ).where(
+        IdeaComment.user_id == target_user.user_id
+    ).order_by(desc(IdeaComment.created_at)).limit(10)
+    
+    rows = db.execute(
+        union_all(bets_query, ideas_query, replies_query)
+        .order_by(literal_column("created_at").desc())
     ).all()
     
     bets = []
-    for position in active_positions:
-        market = position.contract.market
-        bets.append({
-            "market_id": market.market_id,
-            "contract_title": position.contract.title,
-            "market_title": market.title,
-            "market_category": market.category,
-            "outcome": position.contract_side,
-            "quantity": position.quantity if current_user.user_id == target_user.user_id else None,
-            "avg_price": position.avg_price if current_user.user_id == target_user.user_id else None,
-        })
-    
-    # Get user's ideas
-    ideas = db.query(Idea).options(joinedload(Idea.submitted_by_user)).filter(
-        Idea.submitted_by == target_user.user_id
-    ).order_by(desc(Idea.created_at)).limit(10).all()
-    
     idea_list = []
-    for idea in ideas:
-        idea_list.append({
-            "idea_id": idea.idea_id,
-            "title": idea.title,
-            "description": idea.description,
-            "created_at": idea.created_at,
-            "likes_count": idea.likes_count,
-            "comments_count": idea.comments_count,
-        })
-    
-    # Get user's comments (replies)
-    comments = db.query(IdeaComment).options(
-        joinedload(IdeaComment.idea)
-    ).filter(
-        IdeaComment.user_id == target_user.user_id
-    ).order_by(desc(IdeaComment.created_at)).limit(10).all()
-    
     replies = []
-    for comment in comments:
-        replies.append({
-            "comment_id": comment.comment_id,
-            "content": comment.content,
-            "created_at": comment.created_at,
-            "idea_title": comment.idea.title,
-            "idea_id": comment.idea.idea_id,
-        })
-    
-    is_own_profile = current_user.user_id == target_user.user_id
+    for row in rows:
+        if row.kind == "bet":
+            bets.append({
+                "market_id": row.id,
+                "contract_title": row.title,
+                "market_title": row.text,
+                "market_category": row.category,
+                "outcome": row.outcome,
+                "quantity": row.quantity if is_own_profile else None,
+                "avg_price": row.avg_price if is_own_profile else None,
+            })
+        elif row.kind == "idea":
+            idea_list.append({
+                "idea_id": row.id,
+                "title": row.title,
+                "description": row.text,
+                "created_at": row.created_at,
+                "likes_count": row.likes_count,
+                "comments_count": row.comments_count,
+            })
+        else:
+            replies.append({
+                "comment_id": row.id,
+                "content": row.title,
+                "created_at": row.created_at,
+                "idea_title": row.text,
+                "idea_id": row.idea_id,
+            })
     
     return {
         "user_id": target_user.user_id,
@@ -123,49 +195,30 @@ def get_user_profile(
 def toggle_follow(
     username: str,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
 ):
     """Follow or unfollow a user"""
-    target_user = db.query(User).filter(User.username == username).first()
-    if not target_user:
+    row = db.execute(
+        TOGGLE_USER_FOLLOW, {"username": username, "follower_id": current_user.user_id}
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
     
-    if current_user.user_id == target_user.user_id:
+    if current_user.user_id == row.user_id:
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
     
-    existing_follow = db.query(UserFollow).filter(
-        UserFollow.follower_id == current_user.user_id,
-        UserFollow.following_id == target_user.user_id
-    ).first()
-    
-    if existing_follow:
-        # Unfollow
-        db.delete(existing_follow)
-        is_following = False
-    else:
-        # Follow
-        follow = UserFollow(
-            follower_id=current_user.user_id,
-            following_id=target_user.user_id
-        )
-        db.add(follow)
-        is_following = True
-    
     db.commit()
     
-    # Get updated follower count
-    followers_count = db.query(UserFollow).filter(UserFollow.following_id == target_user.user_id).count()
-    
     return {
-        "is_following": is_following,
-        "followers_count": followers_count
+        "is_following": row.is_following,
+        "followers_count": row.followers_count
     }
 
 @router.get("/{username}/activity", response_model=List[UserActivityResponse])
 def get_user_activity(
     username: str,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_user_cached),
     skip: int = 0,
     limit: int = 20,
 ):
@@ -177,55 +230,56 @@ def get_user_activity(
     if current_user.user_id != target_user.user_id:
         raise HTTPException(status_code=403, detail="Can only view your own activity")
     
-    # This is a simplified activity feed - in a real app you'd have a dedicated activity table
-    activities = []
-    
-    # Get recent ideas
-    recent_ideas = db.query(Idea).filter(
+    # This is a simplified activity feed - in a real app you'd have a dedicated activity table.
+    # Ideas, comments and resolved bets are merged in one UNION ALL and paged
+    # in SQL, so older items from one source aren't crowded out by another
+    ideas_query = select(
+        literal("idea_created").label("type"),
+        Idea.created_at.label("created_at"),
+        Idea.title.label("title"),
+        Idea.idea_id.label("related_id"),
+        cast(null(), Boolean).label("is_win"),
+    ).where(
         Idea.submitted_by == target_user.user_id
-    ).order_by(desc(Idea.created_at)).limit(limit).all()
-    
-    for idea in recent_ideas:
-        activities.append({
-            "type": "idea_created",
-            "created_at": idea.created_at,
-            "description": f"Posted idea: {idea.title}",
-            "related_id": idea.idea_id,
-        })
-    
-    # Get recent comments
-    recent_comments = db.query(IdeaComment).options(
-        joinedload(IdeaComment.idea)
-    ).filter(
+    )
+    comments_query = select(
+        literal("comment_created"), IdeaComment.created_at, Idea.title, Idea.idea_id, null(),
+    ).join(
+        Idea, IdeaComment.idea_id == Idea.idea_id
+    ).where(
         IdeaComment.user_id == target_user.user_id
-    ).order_by(desc(IdeaComment.created_at)).limit(limit).all()
-    
-    for comment in recent_comments:
-        activities.append({
-            "type": "comment_created",
-            "created_at": comment.created_at,
-            "description": f"Replied to: {comment.idea.title}",
-            "related_id": comment.idea.idea_id,
-        })
-
-    # Get recent resolved bets
-    resolved_positions = db.query(Position).join(Position.contract).join(Contract.market).filter(
+    )
+    resolved_bets_query = select(
+        literal("bet_resolved"), Market.resolve_time, Market.title, Market.market_id,
+        Contract.resolution == Position.contract_side,
+    ).select_from(Position).join(
+        Contract, Position.contract_id == Contract.contract_id
+    ).join(
+        Market, Contract.market_id == Market.market_id
+    ).where(
         Position.user_id == target_user.user_id,
         Market.status == 'resolved',
-        Market.resolve_time is not None
-    ).order_by(desc(Market.resolve_time)).limit(limit).all()
-
-    for pos in resolved_positions:
-        market = pos.contract.market
-        is_win = market.result == pos.contract.outcome
-        
+        Market.resolve_time.isnot(None)
+    )
+    
+    feed = union_all(ideas_query, comments_query, resolved_bets_query).subquery()
+    rows = db.execute(
+        select(feed).order_by(feed.c.created_at.desc()).offset(skip).limit(limit)
+    ).all()
+    
+    activities = []
+    for row in rows:
+        if row.type == "idea_created":
+            description = f"Posted idea: {row.title}"
+        elif row.type == "comment_created":
+            description = f"Replied to: {row.title}"
+        else:
+            description = f"Bet on '{row.title}' resolved. You {'won' if row.is_win else 'lost'}."
         activities.append({
-            "type": "bet_resolved",
-            "created_at": market.resolve_time,
-            "description": f"Bet on '{market.title}' resolved. You {'won' if is_win else 'lost'}.",
-            "related_id": market.market_id,
+            "type": row.type,
+            "created_at": row.created_at,
+            "description": description,
+            "related_id": row.related_id,
         })
     
-    # Sort by date and limit
-    activities.sort(key=lambda x: x["created_at"], reverse=True)
-    return activities[skip:skip + limit] 
\ No newline at end of file
+    return activities 
\ No newline at end of file
@@ -2,67 +2,44 @@
 System monitoring and metrics endpoints for the trading engine.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends
 from typing import Dict, Any
 
 from app.api import deps
-from app.models.user import User
 from app.core.trading_metrics import get_metrics_collector
 
 router = APIRouter()
 
 @router.get("/metrics", response_model=Dict[str, Any])
 def get_trading_metrics(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
 ):
     """
     Get comprehensive trading engine metrics.
     Requires admin privileges.
     """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can access system metrics"
-        )
-    
     metrics_collector = get_metrics_collector()
     return metrics_collector.get_current_metrics()
 
 @router.get("/health", response_model=Dict[str, Any])
 def get_system_health(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
 ):
     """
     Get system health status.
     Requires admin privileges.
     """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can access system health"
-        )
-    
     metrics_collector = get_metrics_collector()
     return metrics_collector.get_health_status()
 
 @router.post("/metrics/reset")
 def reset_metrics(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
 ):
     """
     Reset all metrics (useful for testing).
     Requires admin privileges.
     """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can reset metrics"
-        )
-    
     metrics_collector = get_metrics_collector()
     metrics_collector.reset_metrics()
     
@@ -70,22 +47,14 @@ def reset_metrics(
 
 @router.get("/performance/summary")
 def get_performance_summary(
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
 ):
     """
     Get a simplified performance summary for dashboards.
     Requires admin privileges.
     """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can access performance data"
-        )
-    
     metrics_collector = get_metrics_collector()
-    health = metrics_collector.get_health_status()
-    metrics = metrics_collector.get_current_metrics()
+    metrics, health = metrics_collector.get_snapshot()
     
     return {
         "system_status": health["status"],
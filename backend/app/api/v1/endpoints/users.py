@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 import os
 import uuid
@@ -20,18 +20,21 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Profile pictures are served from here via the /uploads static mount
+PROFILE_PICTURE_DIR = Path("uploads/profile_pictures")
+PROFILE_PICTURE_DIR.mkdir(parents=True, exist_ok=True)
+ALLOWED_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp"}
+
 @router.get("/", response_model=List[UserResponse])
 def read_users(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.CurrentUser = Depends(deps.require_admin),
 ):
     """
     Retrieve users (admin only).
     """
-    if not current_user.is_superuser:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     users = db.query(User).offset(skip).limit(limit).all()
     return users
 
@@ -143,14 +146,18 @@ async def update_profile(
                 detail="File size must be under 10MB"
             )
         
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("uploads/profile_pictures")
-        upload_dir.mkdir(parents=True, exist_ok=True)
+        # Validate extension (files without one are stored as .jpg)
+        _, dot, file_extension = (profile_picture.filename or "").rpartition('.')
+        file_extension = file_extension.lower() if dot else 'jpg'
+        if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Image must be a JPG, PNG, GIF or WebP file"
+            )
         
         # Generate unique filename
-        file_extension = profile_picture.filename.split('.')[-1] if profile_picture.filename else 'jpg'
         filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = upload_dir / filename
+        file_path = PROFILE_PICTURE_DIR / filename
         
         # Save new file first
         try:
@@ -208,6 +215,9 @@ async def update_profile(
         db.commit()
         db.refresh(current_user)
     
+    deps.invalidate_cached_user(current_user.email)
+    # Cached feed pages embed the author's username and picture
+    deps.invalidate_feed_cache()
     return current_user
 
 @router.put("/password")
@@ -253,6 +263,8 @@ def delete_account(
     # Delete user (cascade will handle related data)
     db.delete(current_user)
     db.commit()
+    deps.invalidate_cached_user(current_user.email)
+    deps.invalidate_feed_cache()
     
     return {"message": "Account deleted successfully"} 
 
@@ -266,7 +278,7 @@ def get_user_positions(
     Get user's positions, optionally filtered by market.
     """
     query = db.query(Position).options(
-        joinedload(Position.contract).joinedload(Contract.market)
+        selectinload(Position.contract).selectinload(Contract.market)
     ).filter(
         Position.user_id == current_user.user_id,
         Position.quantity != 0  # Only show non-zero positions
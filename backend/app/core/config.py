@@ -22,6 +22,12 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "sidebet"
     SQLALCHEMY_DATABASE_URI: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
     
+    # Connection pool sizing (tune against concurrent dashboard load)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT: int = 5  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Recycle connections after 30 minutes
+    
     # Security
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
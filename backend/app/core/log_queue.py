@@ -0,0 +1,39 @@
+"""
+Non-blocking application logging.
+
+Request handlers only enqueue log records; a background QueueListener thread
+formats them and writes to stderr, so a burst of errors never blocks the
+event loop or the endpoint threadpool on console I/O.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+def start_log_listener(level: int = logging.INFO) -> None:
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def stop_log_listener() -> None:
+    global _listener
+    if _listener is not None:
+        # Flushes any queued records before returning
+        _listener.stop()
+        _listener = None
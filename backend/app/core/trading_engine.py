@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, text
+from sqlalchemy import and_, or_, func, text
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from decimal import Decimal
 import logging
 from contextlib import contextmanager
@@ -13,11 +13,23 @@ from app.models.trade import Trade
 from app.models.position import Position
 from app.models.contract import Contract
 from app.models.user import User
+from app.core.cache import TTLCache
 from app.core.trading_metrics import get_metrics_collector
 from app.models.market import Market
 
 logger = logging.getLogger(__name__)
 
+# Listing stats per (contract_id, contract_side) and market (midpoint) prices
+# per contract_id, shared by all requests for up to a second; order placement
+# and cancellation evict the contract's entries
+contract_stats_cache = TTLCache(maxsize=10_000, ttl=1.0)
+market_price_cache = TTLCache(maxsize=10_000, ttl=1.0)
+
+def invalidate_contract_stats(contract_id: int) -> None:
+    for side in ("YES", "NO"):
+        contract_stats_cache.pop((contract_id, side))
+    market_price_cache.pop(contract_id)
+
 class TradingEngine:
     """
     Order matching engine for binary prediction markets with robust concurrency controls.
@@ -169,6 +181,7 @@ class TradingEngine:
             
             # Refresh order to get final state
             self.db.refresh(order)
+            invalidate_contract_stats(contract_id)
             
             # Complete metrics tracking
             self.metrics.complete_order_tracking(
@@ -552,6 +565,67 @@ class TradingEngine:
             "order_book": order_book
         }
     
+    def get_contract_stats_bulk(self, contract_ids: List[int]) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """
+        Get best ask price and trade volume for both sides of many contracts at once.
+    
+        Returns a dictionary keyed by (contract_id, contract_side) holding the
+        "best_ask_price" and "total_volume" entries of get_contract_stats, using
+        two aggregate queries instead of several queries per contract side.
+        Entries are served from contract_stats_cache when fresh; callers must
+        not mutate them.
+        """
+        stats = {}
+        missing = []
+        for contract_id in contract_ids:
+            yes_stats = contract_stats_cache.get((contract_id, "YES"))
+            no_stats = contract_stats_cache.get((contract_id, "NO"))
+            if yes_stats is None or no_stats is None:
+                missing.append(contract_id)
+            else:
+                stats[(contract_id, "YES")] = yes_stats
+                stats[(contract_id, "NO")] = no_stats
+        if not missing:
+            return stats
+        
+        fresh = {
+            (contract_id, side): {"best_ask_price": None, "total_volume": 0}
+            for contract_id in missing
+            for side in ("YES", "NO")
+        }
+        
+        # Lowest open sell order with remaining quantity per contract side
+        best_asks = self.db.query(
+            Order.contract_id, Order.contract_side, func.min(Order.price)
+        ).filter(
+            and_(
+                Order.contract_id.in_(missing),
+                Order.side == "SELL",
+                Order.status == "open",
+                Order.quantity > Order.filled_quantity
+            )
+        ).group_by(Order.contract_id, Order.contract_side).all()
+        
+        for contract_id, contract_side, price in best_asks:
+            if (contract_id, contract_side) in fresh:
+                fresh[(contract_id, contract_side)]["best_ask_price"] = float(price)
+        
+        # Trade counts per contract side, attributed by the buy order's side
+        volumes = self.db.query(
+            Trade.contract_id, Order.contract_side, func.count(Trade.trade_id)
+        ).join(Order, Trade.buy_order_id == Order.order_id).filter(
+            Trade.contract_id.in_(missing)
+        ).group_by(Trade.contract_id, Order.contract_side).all()
+        
+        for contract_id, contract_side, count in volumes:
+            if (contract_id, contract_side) in fresh:
+                fresh[(contract_id, contract_side)]["total_volume"] = count
+        
+        for key, value in fresh.items():
+            contract_stats_cache.set(key, value)
+        stats.update(fresh)
+        return stats
+    
     def cancel_order(self, order_id: int, user_id: int) -> bool:
         """
         Cancel an open order with proper concurrency controls.
@@ -585,7 +659,9 @@ class TradingEngine:
                             user.balance += refund_amount
                 
                 order.status = "cancelled"
+                contract_id = order.contract_id
                 
+            invalidate_contract_stats(contract_id)
             return True
         except Exception as e:
             logger.error(f"Failed to cancel order {order_id}: {e}")
@@ -644,12 +720,47 @@ class TradingEngine:
         """
         Get current market prices for all contracts in a market.
         Returns a dictionary mapping contract_id to market_price.
-        Used for market cards to display probabilities.
+        Used for market cards to display probabilities; prices are served from
+        market_price_cache when fresh.
         """
-        contracts = self.db.query(Contract).filter(Contract.market_id == market_id).all()
+        contract_ids = [
+            contract_id for (contract_id,) in
+            self.db.query(Contract.contract_id).filter(Contract.market_id == market_id)
+        ]
         
+        missing = object()
         market_prices = {}
-        for contract in contracts:
-            market_prices[contract.contract_id] = self.get_market_price(contract.contract_id)
+        stale = []
+        for contract_id in contract_ids:
+            price = market_price_cache.get(contract_id, missing)
+            if price is missing:
+                stale.append(contract_id)
+            else:
+                market_prices[contract_id] = price
+        if not stale:
+            return market_prices
+        
+        # Highest YES bid and lowest YES ask with remaining quantity per contract,
+        # matching what get_market_price reads from the order book
+        quotes = self.db.query(
+            Order.contract_id,
+            func.max(Order.price).filter(Order.side == "BUY"),
+            func.min(Order.price).filter(Order.side == "SELL")
+        ).filter(
+            and_(
+                Order.contract_id.in_(stale),
+                Order.contract_side == "YES",
+                Order.status == "open",
+                Order.quantity > Order.filled_quantity
+            )
+        ).group_by(Order.contract_id).all()
+        quotes = {contract_id: (bid, ask) for contract_id, bid, ask in quotes}
+        
+        for contract_id in stale:
+            bid, ask = quotes.get(contract_id, (None, None))
+            # Midpoint only when both sides of the YES book exist
+            price = (bid + ask) / 2 if bid is not None and ask is not None else None
+            market_price_cache.set(contract_id, price)
+            market_prices[contract_id] = price
         
         return market_prices 
\ No newline at end of file
@@ -11,7 +11,7 @@ for the concurrent trading engine to track:
 
 import time
 import threading
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
@@ -19,6 +19,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Metrics/health snapshots are reused for this long, so concurrent dashboard
+# polls share one computation instead of each re-sorting under the lock
+SNAPSHOT_TTL_SECONDS = 0.5
+
 @dataclass
 class OrderMetrics:
     """Metrics for a single order placement."""
@@ -97,6 +101,9 @@ class TradingMetricsCollector:
             "500ms-1s": 0,
             "1s+": 0
         }
+        
+        # (computed_at monotonic time, metrics dict, health dict)
+        self._snapshot: Optional[Tuple[float, Dict[str, Any], Dict[str, Any]]] = None
     
     def start_order_tracking(self, user_id: int, contract_id: int, side: str, 
                            contract_side: str, quantity: int, price: Optional[float]) -> str:
@@ -216,8 +223,24 @@ class TradingMetricsCollector:
             self.metrics.p95_order_latency = sorted_durations[p95_idx]
             self.metrics.p99_order_latency = sorted_durations[p99_idx]
     
+    def get_snapshot(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get (metrics, health), recomputed at most every SNAPSHOT_TTL_SECONDS."""
+        with self.lock:
+            now = time.monotonic()
+            if self._snapshot is None or now - self._snapshot[0] >= SNAPSHOT_TTL_SECONDS:
+                metrics = self._compute_metrics()
+                self._snapshot = (now, metrics, self._compute_health(metrics))
+            return self._snapshot[1], self._snapshot[2]
+    
     def get_current_metrics(self) -> Dict[str, Any]:
         """Get current metrics snapshot."""
+        return self.get_snapshot()[0]
+    
+    def get_health_status(self) -> Dict[str, Any]:
+        """Get system health status."""
+        return self.get_snapshot()[1]
+    
+    def _compute_metrics(self) -> Dict[str, Any]:
         with self.lock:
             uptime = time.time() - self.start_time
             
@@ -255,10 +278,7 @@ class TradingMetricsCollector:
                 "recent_hourly_stats": dict(list(self.metrics.hourly_stats.items())[-24:])  # Last 24 hours
             }
     
-    def get_health_status(self) -> Dict[str, Any]:
-        """Get system health status."""
-        metrics = self.get_current_metrics()
-        
+    def _compute_health(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         # Define health thresholds
         health_status = "healthy"
         issues = []
@@ -301,6 +321,7 @@ class TradingMetricsCollector:
             self.active_orders.clear()
             self.start_time = time.time()
             self.latency_buckets = {k: 0 for k in self.latency_buckets}
+            self._snapshot = None
 
 # Global metrics collector instance
 metrics_collector = TradingMetricsCollector()
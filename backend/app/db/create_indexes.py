@@ -4,6 +4,7 @@ Run this after creating the tables to add performance indexes.
 """
 from sqlalchemy import text
 from app.db.session import engine
+from app.models.market import SEARCH_TSV_EXPRESSION
 
 def create_performance_indexes():
     """Create additional indexes for optimal query performance."""
@@ -11,10 +12,14 @@ def create_performance_indexes():
     indexes = [
         # Markets table indexes
         "CREATE INDEX IF NOT EXISTS idx_markets_status_close_time ON markets (status, close_time);",
+        "CREATE INDEX IF NOT EXISTS idx_markets_status_category ON markets (status, category);",  # market list category filter
+        "CREATE INDEX IF NOT EXISTS idx_markets_status_resolve_time ON markets (status, resolve_time DESC);",  # resolved bets in activity
+        "CREATE INDEX IF NOT EXISTS idx_markets_title_lower ON markets (lower(title) text_pattern_ops);",  # search prefix matches
         
         # Orders table indexes for fast matching
         "CREATE INDEX IF NOT EXISTS idx_orders_contract_status ON orders (contract_id, status);",
         "CREATE INDEX IF NOT EXISTS idx_orders_user_status ON orders (user_id, status);",
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_contract_created ON orders (user_id, contract_id, created_at DESC);",  # a user's orders in a market
         "CREATE INDEX IF NOT EXISTS idx_orders_open_status ON orders (contract_id) WHERE status = 'open';",  # Partial index for open orders
         
         # Trades table indexes
@@ -27,17 +32,127 @@ def create_performance_indexes():
         # Contracts table indexes
         "CREATE INDEX IF NOT EXISTS idx_contracts_market_id ON contracts (market_id);",
         "CREATE INDEX IF NOT EXISTS idx_contracts_market_status ON contracts (market_id, status);",
+        
+        # Idea comments by idea, for the detail view's comment query
+        "CREATE INDEX IF NOT EXISTS idx_idea_comments_idea_id ON idea_comments (idea_id, created_at);",
+        
+        # Ideas table indexes for the home/following and trending feed keyset pagination
+        "CREATE INDEX IF NOT EXISTS idx_ideas_created_at ON ideas (created_at DESC, idea_id DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_ideas_trending ON ideas (likes_count DESC, created_at DESC, idea_id DESC);",
+        
+        # Ideas table index for admin moderation keyset pagination
+        "CREATE INDEX IF NOT EXISTS idx_ideas_status_created_at ON ideas (status, created_at DESC, idea_id DESC);",
+        
+        # Foreign-key indexes so deleting a user doesn't seq-scan child tables during cascade
+        # (orders, positions, likes and bookmarks are already covered by user_id-leading indexes)
+        "CREATE INDEX IF NOT EXISTS idx_trades_buy_order_id ON trades (buy_order_id);",
+        "CREATE INDEX IF NOT EXISTS idx_trades_sell_order_id ON trades (sell_order_id);",
+        "CREATE INDEX IF NOT EXISTS idx_ideas_submitted_by ON ideas (submitted_by);",
+        "CREATE INDEX IF NOT EXISTS idx_idea_comments_user_idea ON idea_comments (user_id, idea_id);",  # also serves the "replies" feed
+        "CREATE INDEX IF NOT EXISTS idx_user_follows_following_id ON user_follows (following_id);",
+        
+        # Partial indexes for the flag/status filters used by the admin stats endpoints
+        "CREATE INDEX IF NOT EXISTS idx_users_superuser ON users (user_id) WHERE is_superuser;",
+        "CREATE INDEX IF NOT EXISTS idx_users_active ON users (user_id) WHERE is_active;",
+        "CREATE INDEX IF NOT EXISTS idx_markets_open ON markets (market_id) WHERE status = 'open';",
+        "CREATE INDEX IF NOT EXISTS idx_orders_active ON orders (order_id) WHERE status IN ('open', 'partially_filled');",
+        
+        # Case-insensitive uniqueness / lookup for registration checks
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_lower ON users (lower(email));",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username_lower ON users (lower(username));",
+        
+        # Users table trigram indexes for admin substring search
+        # (kept last: they need the pg_trgm extension, which may require elevated privileges)
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+        "CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON users USING gin (lower(username) gin_trgm_ops);",
+        "CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops);",
+        
+        # Markets table trigram indexes for the search endpoint's ILIKE substring matching
+        "CREATE INDEX IF NOT EXISTS idx_markets_title_trgm ON markets USING gin (title gin_trgm_ops);",
+        "CREATE INDEX IF NOT EXISTS idx_markets_description_trgm ON markets USING gin (description gin_trgm_ops);",
+        "CREATE INDEX IF NOT EXISTS idx_markets_category_trgm ON markets USING gin (category gin_trgm_ops);",
     ]
     
-    with engine.connect() as conn:
+    # Autocommit each statement so one failure (e.g. missing privileges or
+    # duplicate data) doesn't abort the transaction for the remaining indexes
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
         for index_sql in indexes:
             try:
                 conn.execute(text(index_sql))
                 print(f"✓ Created index: {index_sql.split('idx_')[1].split(' ')[0] if 'idx_' in index_sql else 'partial index'}")
             except Exception as e:
                 print(f"✗ Failed to create index: {e}")
-        conn.commit()
+
+def create_volume_counters():
+    """
+    Maintain markets.total_volume (sum of quantity * price over the market's
+    trades) with an AFTER INSERT OR DELETE trigger on trades, so volume reads
+    never rescan the trades table. Deletes matter because trades cascade away
+    with their orders (and so with deleted users).
+    
+    The trigger row-locks the market for the rest of the trade's transaction,
+    so trades across all of a market's contracts serialize on that row, and
+    writers that touch both must lock contracts before the market (see
+    _lock_market_contracts in the markets endpoints).
+    """
+    statements = [
+        "ALTER TABLE markets ADD COLUMN IF NOT EXISTS total_volume NUMERIC(18, 4) NOT NULL DEFAULT 0;",
+        """
+        CREATE OR REPLACE FUNCTION trades_update_market_volume() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                UPDATE markets SET total_volume = total_volume - OLD.quantity * OLD.price
+                WHERE market_id = (SELECT market_id FROM contracts WHERE contract_id = OLD.contract_id);
+            ELSE
+                UPDATE markets SET total_volume = total_volume + NEW.quantity * NEW.price
+                WHERE market_id = (SELECT market_id FROM contracts WHERE contract_id = NEW.contract_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        "DROP TRIGGER IF EXISTS trg_trades_market_volume ON trades;",
+        "DROP FUNCTION IF EXISTS trades_add_market_volume();",
+        "CREATE TRIGGER trg_trades_market_volume AFTER INSERT OR DELETE ON trades "
+        "FOR EACH ROW EXECUTE FUNCTION trades_update_market_volume();",
+        # Reconcile counters with trades recorded (or removed) before the trigger
+        # existed, including markets that no longer have any trades
+        """
+        UPDATE markets m SET total_volume = COALESCE(v.volume, 0)
+        FROM markets m2
+        LEFT JOIN (
+            SELECT c.market_id, SUM(t.quantity * t.price) AS volume
+            FROM trades t JOIN contracts c ON c.contract_id = t.contract_id
+            GROUP BY c.market_id
+        ) v ON v.market_id = m2.market_id
+        WHERE m2.market_id = m.market_id AND m.total_volume IS DISTINCT FROM COALESCE(v.volume, 0);
+        """,
+    ]
+    
+    # Run as one transaction so the trigger and backfill land together
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    print("✓ Market volume counters installed")
+
+def create_market_search():
+    """
+    Add the generated markets.search_tsv full-text column (created by
+    create_all on new databases) and its GIN index.
+    """
+    statements = [
+        "ALTER TABLE markets ADD COLUMN IF NOT EXISTS search_tsv tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_TSV_EXPRESSION}) STORED;",
+        "CREATE INDEX IF NOT EXISTS idx_markets_search_tsv ON markets USING gin (search_tsv);",
+    ]
+    
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    print("✓ Market full-text search column installed")
 
 if __name__ == "__main__":
+    create_volume_counters()
+    create_market_search()
     create_performance_indexes()
     print("Database indexes creation completed.") 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from app.db.base import Base
 from app.db.session import engine, SessionLocal
-from app.db.create_indexes import create_performance_indexes
+from app.db.create_indexes import create_performance_indexes, create_volume_counters, create_market_search
 from app.models.user import User
 from app.core.security import get_password_hash
 
@@ -8,7 +8,12 @@ def init_db() -> None:
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
-    # Create performance indexes
+    # Columns and triggers that mapped models and endpoints depend on; let a
+    # failure here abort startup rather than surface later as 500s
+    create_volume_counters()
+    create_market_search()
+    
+    # Create performance indexes (optional: the app works without them, just slower)
     try:
         create_performance_indexes()
         print("✓ Database tables and indexes created successfully")
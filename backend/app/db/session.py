@@ -7,10 +7,13 @@ from app.core.config import settings
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     poolclass=QueuePool,
-    pool_size=20,  # Number of connections to maintain in the pool
-    max_overflow=30,  # Additional connections that can be created on demand
+    pool_size=settings.DB_POOL_SIZE,  # Number of connections to maintain in the pool
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Additional connections that can be created on demand
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Fail fast instead of queueing behind a saturated pool
     pool_pre_ping=True,  # Validate connections before use
-    pool_recycle=3600,  # Recycle connections after 1 hour
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle stale connections
+    executemany_mode="values_plus_batch",  # Batch executemany() via psycopg2 fast execution helpers
+    insertmanyvalues_page_size=1000,  # Rows per multi-VALUES INSERT page
     echo=False,  # Set to True for SQL debugging
 )
 
@@ -1,8 +1,15 @@
-from sqlalchemy import Column, BigInteger, String, Text, DateTime, CheckConstraint
+from sqlalchemy import Column, BigInteger, String, Text, DateTime, Numeric, CheckConstraint, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.db.base_class import Base
 
+# Full-text search document over the searchable market fields
+SEARCH_TSV_EXPRESSION = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(category, ''))"
+)
+
 class Market(Base):
     __tablename__ = "markets"
 
@@ -17,6 +24,8 @@ class Market(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())  # when market was created
     status = Column(String(12), default='open', nullable=False)
     result = Column(String(10))
+    total_volume = deferred(Column(Numeric(18, 4), nullable=False, server_default="0"))  # maintained by the trades trigger; only read by admin stats
+    search_tsv = deferred(Column(TSVECTOR, Computed(SEARCH_TSV_EXPRESSION, persisted=True)))  # only read by search
     
     # Add check constraints
     __table_args__ = (
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, ConfigDict, EmailStr, constr
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -18,8 +18,7 @@ class UserResponse(BaseModel):
     balance: int
     profile_picture: str | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
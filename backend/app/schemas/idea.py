@@ -8,6 +8,13 @@ class IdeaStatus(str, Enum):
     ACCEPTED = "accepted"
     REJECTED = "rejected"
 
+class FeedFilter(str, Enum):
+    HOME = "home"
+    TRENDING = "trending"
+    BOOKMARKED = "bookmarked"
+    REPLIES = "replies"
+    FOLLOWING = "following"
+
 class IdeaBase(BaseModel):
     title: str
     description: Optional[str] = None
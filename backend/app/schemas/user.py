@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, ConfigDict, EmailStr, constr
+from datetime import datetime
 from typing import Optional
 
 class UserBase(BaseModel):
@@ -17,8 +18,11 @@ class UserResponse(UserBase):
     balance: int
     profile_picture: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class AdminUserResponse(UserResponse):
+    is_verified: bool
+    created_at: Optional[datetime] = None
 
 class UserProfileUpdate(BaseModel):
     username: constr(min_length=3, max_length=12, pattern=r'^[a-zA-Z0-9_]+$')
@@ -36,5 +40,4 @@ class UserProfile(BaseModel):
     balance: int
     profile_picture: Optional[str] = None
     
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
@@ -5,25 +5,39 @@ from app.db import base  # noqa
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.log_queue import start_log_listener, stop_log_listener
+from app.core.security import shutdown_hash_executor
 from app.db.init_db import init_db
 from contextlib import asynccontextmanager
+import anyio
 import os
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup event
+    start_log_listener()
     init_db()
+    # Sync endpoints run on AnyIO's worker threads; size that pool to the DB
+    # connection pool so every worker can hold a connection without queueing
+    # behind the default 40-thread limit or timing out waiting for the pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
     yield
-    # Shutdown event (if needed)
+    # Shutdown event
+    shutdown_hash_executor()
+    stop_log_listener()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Set up CORS
@@ -33,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor for list endpoints
 )
 
 # Include API router
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1.endpoints.markets import _parse_datetime
+from app.core.config import settings
+from main import app
+
+ADMIN = deps.CurrentUser(
+    user_id=1,
+    email="admin@college.harvard.edu",
+    username="admin",
+    profile_picture=None,
+    is_active=True,
+    is_superuser=True,
+)
+
+@pytest.fixture
+def client():
+    # The datetime check runs before any query, so no database is needed
+    app.dependency_overrides[deps.get_current_user_cached] = lambda: ADMIN
+    app.dependency_overrides[deps.get_db] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+@pytest.mark.parametrize("value, expected", [
+    ("2030-01-01T12:00:00Z", datetime(2030, 1, 1, 12, tzinfo=timezone.utc)),
+    ("2030-01-01T12:00:00+00:00", datetime(2030, 1, 1, 12, tzinfo=timezone.utc)),
+    ("2030-01-01T12:00", datetime(2030, 1, 1, 12)),
+])
+def test_parse_datetime_accepts_iso_8601(value, expected):
+    assert _parse_datetime(value) == expected
+
+@pytest.mark.parametrize("value", ["1700000000", "0", "-1", "1700000000.5", "not a date", "2030-13-01T00:00"])
+def test_parse_datetime_rejects_non_iso(value):
+    with pytest.raises(ValueError):
+        _parse_datetime(value)
+
+def test_create_market_rejects_numeric_start_time(client):
+    response = client.post(
+        f"{settings.API_V1_STR}/markets/",
+        data={
+            "title": "Will it snow?",
+            "category": "weather",
+            "start_time": "1700000000",
+            "close_time": "2030-01-01T00:00:00Z",
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid datetime format")